@@ -0,0 +1,20 @@
+from src import limoon
+from src.limoon import core, utils
+from benchmarks.test_parser import FIXTURES
+
+
+def test_append(benchmark, tmp_path):
+    archive = limoon.Archive(str(tmp_path))
+    r = utils.build_response(200, "https://eksisozluk.com/linux--32084", (FIXTURES / "topic.html").read_bytes())
+
+    benchmark(archive.append, "https://eksisozluk.com/linux--32084", r)
+
+
+def test_replay_get_topic(benchmark, replay, monkeypatch, tmp_path):
+    monkeypatch.setattr(core, "archive", limoon.Archive(str(tmp_path)))
+    limoon.get_topic("linux--32084")
+    monkeypatch.setattr(core, "archive", limoon.Archive(str(tmp_path), "replay"))
+
+    entrys = benchmark(lambda: list(limoon.get_topic("linux--32084").entrys))
+
+    assert len(entrys) == 10
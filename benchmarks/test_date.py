@@ -0,0 +1,48 @@
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.limoon import models
+
+
+def date_strings(count=100_000):
+    rng = random.Random(1999)
+    start = datetime(1999, 2, 15)
+    dates = []
+
+    for _ in range(count):
+        created = start + timedelta(minutes=rng.randrange(14_000_000))
+        edited = created + timedelta(minutes=rng.randrange(3 * 24 * 60))
+        shape = rng.randrange(4)
+
+        if shape == 0:
+            dates.append(created.strftime("%d.%m.%Y"))
+        elif shape == 1:
+            dates.append(created.strftime("%d.%m.%Y %H:%M"))
+        elif shape == 2 or edited.date() == created.date():
+            dates.append(created.strftime("%d.%m.%Y %H:%M ~ ") + edited.strftime("%H:%M"))
+        else:
+            dates.append(created.strftime("%d.%m.%Y %H:%M ~ ") + edited.strftime("%d.%m.%Y %H:%M"))
+
+    return dates
+
+
+def strptime_datetime(stuff):
+    created_str, _, edited_str = map(str.strip, stuff.partition("~"))
+    fmt = "%d.%m.%Y %H:%M" if " " in created_str else "%d.%m.%Y"
+    created = datetime.strptime(created_str, fmt)
+
+    if not edited_str:
+        return created, False
+    if "." in edited_str:
+        return created, datetime.strptime(edited_str, "%d.%m.%Y %H:%M")
+    return created, datetime.strptime(f"{created.strftime('%d.%m.%Y')} {edited_str}", "%d.%m.%Y %H:%M")
+
+
+@pytest.mark.parametrize("parser", [strptime_datetime, models.Entry._parse_datetime], ids=["strptime", "limoon"])
+def test_parse_datetime(benchmark, parser):
+    dates = date_strings()
+    results = benchmark(lambda: [parser(date) for date in dates])
+
+    assert results == [strptime_datetime(date) for date in dates]
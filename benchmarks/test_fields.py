@@ -0,0 +1,20 @@
+import pytest
+
+from src.limoon import utils
+from benchmarks.test_parser import page_html
+
+
+FIELDS = {
+    "all": None,
+    "text": ["text"],
+    "ids": ["author_nickname", "favorite_count"],
+}
+
+
+@pytest.mark.parametrize("fields", FIELDS)
+def test_entry_parser_fields(benchmark, fields):
+    html = page_html("topic.html")
+    projection = utils.entry_fields(FIELDS[fields])
+    entrys = benchmark(lambda: list(utils.entry_parser(html, engine="lxml", compact=True, fields=projection)))
+
+    assert len(entrys) == 10
@@ -0,0 +1,18 @@
+import subprocess
+import sys
+from pathlib import Path
+
+
+ROOT = Path(__file__).parent.parent
+
+
+def run(code):
+    subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True)
+
+
+def test_import_limoon(benchmark):
+    benchmark(run, "from src import limoon")
+
+
+def test_import_limoon_core(benchmark):
+    benchmark(run, "from src.limoon import core")
@@ -0,0 +1,14 @@
+import pytest
+
+from src.limoon import instrument, utils
+from benchmarks.test_parser import page_html
+
+
+@pytest.mark.parametrize("hooks", [None, instrument.Hooks, instrument.Metrics])
+def test_entry_parser_hooks(benchmark, monkeypatch, hooks):
+    html = page_html("topic.html")
+    monkeypatch.setattr(instrument, "hooks", None if hooks is None else hooks())
+
+    entrys = benchmark(lambda: list(utils.entry_parser(html, engine="lxml", compact=True)))
+
+    assert len(entrys) == 10
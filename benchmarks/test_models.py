@@ -0,0 +1,48 @@
+import tracemalloc
+from pathlib import Path
+
+import pytest
+
+from src.limoon import models, utils
+
+
+FIXTURES = Path(__file__).parent.parent / "tests" / "fixtures"
+
+
+def entry_args():
+    html = utils.build_response(200, "https://eksisozluk.com", (FIXTURES / "topic.html").read_bytes()).html
+    entry = next(utils.entry_parser(html))
+
+    return (
+        entry.id,
+        entry.author_nickname,
+        entry.text,
+        entry.html,
+        entry.favorite_count,
+        entry.date,
+        entry.topic_title,
+        entry.topic_path,
+        entry.is_pinned,
+        entry.is_pinned_on_profile,
+        entry.images,
+    )
+
+
+@pytest.mark.parametrize("entry_class", [models.Entry, models.CompactEntry])
+def test_entry_construction(benchmark, entry_class):
+    args = entry_args()
+    benchmark(entry_class, *args)
+
+
+@pytest.mark.parametrize("entry_class", [models.Entry, models.CompactEntry])
+def test_entry_memory(benchmark, entry_class):
+    args = entry_args()
+
+    def allocate():
+        tracemalloc.start()
+        entrys = [entry_class(*args) for _ in range(10_000)]
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        return size // len(entrys)
+
+    benchmark.extra_info["bytes_per_entry"] = benchmark.pedantic(allocate, rounds=1)
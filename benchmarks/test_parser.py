@@ -0,0 +1,58 @@
+from pathlib import Path
+
+import pytest
+
+from src import limoon
+from src.limoon import utils
+
+
+FIXTURES = Path(__file__).parent.parent / "tests" / "fixtures"
+
+
+def page_html(name, url="https://eksisozluk.com"):
+    r = utils.build_response(200, url, (FIXTURES / name).read_bytes())
+    r.html.lxml
+    return r.html
+
+
+@pytest.mark.parametrize("engine", ["requests_html", "lxml"])
+def test_entry_parser(benchmark, engine):
+    html = page_html("topic.html")
+    entrys = benchmark(lambda: list(utils.entry_parser(html, engine=engine)))
+
+    assert len(entrys) == 10
+
+
+@pytest.mark.parametrize("engine", ["requests_html", "lxml"])
+def test_entry_parser_per_entry(benchmark, engine):
+    html = page_html("entry.html")
+    entrys = benchmark(lambda: list(utils.entry_parser(html, engine=engine)))
+
+    assert len(entrys) == 1
+
+
+def test_get_topic(benchmark, replay):
+    entrys = benchmark(lambda: list(limoon.get_topic("linux--32084").entrys))
+
+    assert len(entrys) == 10
+
+
+def test_get_entry(benchmark, replay):
+    assert benchmark(limoon.get_entry, 1).id == 1
+
+
+def test_get_author(benchmark, replay):
+    assert benchmark(limoon.get_author, "ssg").nickname == "ssg"
+
+
+def test_entry_post_init(benchmark):
+    entry = next(utils.entry_parser(page_html("topic.html")))
+    benchmark(entry.__post_init__)
+
+
+def test_author_parse_rank(benchmark):
+    html = page_html("author.html")
+    author = utils.author_page_parser(utils.build_response(200, "https://eksisozluk.com/biri/ssg", html.raw_html))
+    rank = html.find("p.muted", first=True)
+
+    assert benchmark(author._parse_rank, rank) == limoon.Rank("kırmızı piyade", 9999)
@@ -0,0 +1,28 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from src import limoon
+
+
+PAGES = 16
+
+
+@pytest.mark.parametrize("processes", [None, 1, 2, 4, 8])
+def test_get_topic_pages(benchmark, replay, processes):
+    executor = None if processes is None else ProcessPoolExecutor(processes)
+
+    try:
+        if executor is not None:
+            list(executor.map(abs, range(processes)))
+
+        entrys = benchmark.pedantic(
+            lambda: list(limoon.get_topic_pages("linux--32084", pages=PAGES, workers=8, processes=executor)),
+            rounds=3,
+        )
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    # Page 2 holds two entrys, the others ten
+    assert len(entrys) == (PAGES - 1) * 10 + 2
@@ -0,0 +1,52 @@
+import random
+from datetime import datetime
+
+import pytest
+
+from src.limoon import models, store
+
+
+ENTRYS = 200_000
+WORDS = ["linux", "gitar", "pena", "çekirdek", "sözlük", "başlık", "entry", "yazar", "debe", "gündem"]
+
+
+@pytest.fixture(scope="module")
+def entry_store():
+    random.seed(0)
+    entry_store = store.EntryStore(compact=True)
+    entry_store.upsert(
+        models.CompactEntry(
+            entry_id,
+            f"yazar{entry_id % 5000}",
+            " ".join(random.choices(WORDS, k=30)) + f" kelime{entry_id}",
+            None,
+            entry_id % 100,
+            f"{1 + entry_id % 28:02}.{1 + entry_id % 12:02}.{1999 + entry_id % 25} 12:00",
+            f"başlık {entry_id % 20000}",
+            f"baslik--{entry_id % 20000}",
+            False,
+            False,
+            None,
+        )
+        for entry_id in range(1, ENTRYS + 1)
+    )
+
+    return entry_store
+
+
+def test_get(benchmark, entry_store):
+    assert benchmark(entry_store.get, ENTRYS // 2).id == ENTRYS // 2
+
+
+def test_find_author(benchmark, entry_store):
+    assert len(benchmark(lambda: list(entry_store.find(author="yazar42")))) == ENTRYS // 5000
+
+
+def test_find_date_range(benchmark, entry_store):
+    entrys = benchmark(lambda: list(entry_store.find(start=datetime(2010, 1, 1), end=datetime(2010, 2, 1))))
+
+    assert all(entry.created.year == 2010 for entry in entrys)
+
+
+def test_search(benchmark, entry_store):
+    assert [entry.id for entry in benchmark(lambda: list(entry_store.search("kelime123456")))] == [123456]
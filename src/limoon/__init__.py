@@ -1,5 +1,6 @@
+import importlib
+
 from .constants import *
-from .core import *
 from .exceptions import *
 from .models import *
 
@@ -8,11 +9,22 @@ __all__ = (
     "BASE_URL",
     "HEADERS",
     "CHANNELS",
+    "Client",
+    "MemoryCache",
+    "SQLiteCache",
+    "Revalidator",
+    "Archive",
+    "TopicFollower",
+    "EntryStore",
+    "EntryScanner",
+    "EntryIndex",
     "Entry",
+    "CompactEntry",
     "Topic",
     "Rank",
     "Badge",
     "Author",
+    "AuthorProfile",
     "SearchResult",
     "Channel",
     "ChannelTopic",
@@ -22,15 +34,62 @@ __all__ = (
     "PageNotFound",
     "SearchResultNotFound",
     "ChannelNotFound",
+    "RateLimited",
+    "NotArchived",
     "ElementNotFound",
+    "request_stats",
     "get_topic",
+    "get_topic_pages",
     "get_entry",
+    "get_entries",
     "get_author",
     "get_author_topic",
     "get_author_rank",
+    "get_author_profile",
+    "get_author_badges",
+    "get_author_last_entrys",
     "get_agenda",
+    "get_agenda_pages",
     "get_debe",
     "get_search_topic",
     "get_random_entry",
+    "get_random_entries",
     "get_channel",
+    "get_channel_pages",
+)
+
+
+# Submodules pulling in requests_html and curl are imported on first attribute access,
+# constants is searched first so reading one does not import them
+_SUBMODULES = (
+    "aio",
+    "archive",
+    "caching",
+    "client",
+    "core",
+    "export",
+    "follow",
+    "instrument",
+    "scan",
+    "store",
+    "utils",
 )
+_LAZY_MODULES = ("constants", "archive", "caching", "core", "follow", "index", "scan", "store")
+
+
+def __getattr__(name: str):
+    if name in _SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+
+    if name in __all__:
+        for module_name in _LAZY_MODULES:
+            module = importlib.import_module(f".{module_name}", __name__)
+
+            if hasattr(module, name):
+                return getattr(module, name)
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,317 @@
+import asyncio
+import time
+import weakref
+from http import HTTPStatus
+from typing import AsyncIterator, Iterable, Optional
+from urllib.parse import urlparse
+
+from curl_cffi.requests import AsyncSession
+from curl_cffi.requests.exceptions import ConnectionError, Timeout
+from requests_html import HTMLResponse
+
+from . import constants, core, exceptions, instrument, models, throttle, utils
+from .core import EntryID, Nickname, SearchKeywords, TopicKeywords
+
+
+# Sessions per event loop, an AsyncSession can not be shared between loops
+_sessions = weakref.WeakKeyDictionary()
+
+
+def get_session() -> AsyncSession:
+    """Return the session of the running event loop, created on first use."""
+
+    loop = asyncio.get_running_loop()
+    session = _sessions.get(loop)
+
+    if session is None:
+        session = _sessions[loop] = AsyncSession(impersonate="chrome", max_clients=constants.AIO_MAX_CLIENTS)
+
+    return session
+
+
+async def close() -> None:
+    """Close the session of the running event loop."""
+
+    session = _sessions.pop(asyncio.get_running_loop(), None)
+
+    if session is not None:
+        await session.close()
+
+
+class AsyncSingleFlight:
+    """Run concurrent coroutines with the same key once per event loop, awaiting callers share the result.
+
+    The shared call is shielded, cancelling one caller does not cancel it for the others.
+    on_shared is called with the result before it is handed to the callers that waited for it.
+    """
+
+    def __init__(self):
+        self._calls: dict = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key, func, *args, on_shared=None):
+        loop = asyncio.get_running_loop()
+        call_key = (loop, key)
+        call = self._calls.get(call_key)
+
+        if call is None:
+            call = self._calls[call_key] = {"task": loop.create_task(func(*args)), "waiters": 0}
+
+            def done(task: asyncio.Task) -> None:
+                self._calls.pop(call_key, None)
+
+                if call["waiters"] and on_shared is not None and not task.cancelled() and task.exception() is None:
+                    on_shared(task.result())
+
+            call["task"].add_done_callback(done)
+        else:
+            call["waiters"] += 1
+
+        return await asyncio.shield(call["task"])
+
+
+_flight = AsyncSingleFlight()
+
+
+async def request(endpoint: str, headers: dict = {}, params: dict = {}) -> HTMLResponse:
+    """Request endpoint, concurrent identical requests share one response when core.coalesce is set."""
+
+    if not core.coalesce:
+        return await _request(endpoint, params)
+
+    return await _flight.do(
+        utils.request_key(constants.BASE_URL + endpoint, params),
+        _request,
+        endpoint,
+        params,
+        on_shared=utils.memoize,
+    )
+
+
+async def _request(endpoint: str, params: dict) -> HTMLResponse:
+    url = constants.BASE_URL + endpoint
+    host = urlparse(url).netloc
+    limiter = core.limiter
+    archive = core.archive
+
+    if archive is not None and archive.replay:
+        key = utils.request_key(url, params)
+        r = archive.get(key)
+
+        if r is None:
+            raise exceptions.NotArchived(key)
+
+        return r
+
+    for attempt in range(constants.RETRIES + 1):
+        if limiter is not None:
+            await limiter.async_wait(host)
+
+        hooks = instrument.hooks
+
+        if hooks is not None:
+            hooks.request_start(url)
+            start = time.perf_counter()
+
+        try:
+            r = await get_session().get(
+                url,
+                params=params,
+                headers=constants.HEADERS,
+                timeout=constants.TIMEOUT,
+            )
+        except (ConnectionError, Timeout) as e:
+            if hooks is not None:
+                hooks.request_end(
+                    instrument.RequestEvent(url, None, 0, time.perf_counter() - start, attempt, error=type(e).__name__)
+                )
+            if limiter is not None:
+                limiter.failure(host)
+            if attempt == constants.RETRIES:
+                raise
+            await asyncio.sleep(throttle.backoff(attempt))
+            continue
+
+        if hooks is not None:
+            hooks.request_end(
+                instrument.RequestEvent(url, r.status_code, len(r.content), time.perf_counter() - start, attempt)
+            )
+
+        if not throttle.is_transient(r.status_code, r.headers, r.content):
+            if limiter is not None:
+                limiter.success(host)
+            break
+
+        if limiter is not None:
+            limiter.failure(host)
+        if attempt < constants.RETRIES:
+            await asyncio.sleep(throttle.backoff(attempt, r.headers.get("Retry-After")))
+    else:
+        if r.status_code == HTTPStatus.TOO_MANY_REQUESTS or throttle.is_challenge(r.status_code, r.headers, r.content):
+            raise exceptions.RateLimited()
+
+    response = utils.build_response(
+        r.status_code,
+        str(r.url),
+        r.content,
+        dict(r.headers),
+        r.encoding,
+    )
+
+    if archive is not None:
+        archive.append(utils.request_key(url, params), response)
+
+    return response
+
+
+async def get_topic(
+    topic_keywords: TopicKeywords,
+    page: int = 1,
+    action: Optional[str] = None,
+    day: Optional[str] = None,
+    author: Optional[str] = None,
+    max_entry: Optional[int] = None,
+    compact: bool = False,
+    keep_html: bool = True,
+    fields: Optional[Iterable[str]] = None,
+) -> models.Topic:
+    """This function get Ekşi Sözlük topic asynchronously.
+
+    Arguments:
+    topic_keywords (str): Keywords (or path) of topic to be get.
+    page (int=1): Specific topic page.
+    action (str|None): Nice or popular.
+    day (str|None): Specific entry day.
+    author (str|None): Specific author nickname.
+    max_entry (int|None): Max entry per topic.
+    compact (bool=False): Parse entrys as slotted models.CompactEntry.
+    keep_html (bool=True): Keep entry html, None if False.
+    fields (Iterable[str]|None): Entry fields to parse, others are None, all fields if None.
+
+    Returns:
+    models.Topic (class): Topic data class.
+    """
+
+    fields = utils.entry_fields(fields)
+
+    r = await request(
+        constants.TOPIC_ROUTE.format(topic_keywords),
+        params=utils.topic_params(page, action, day, author),
+    )
+
+    return utils.parse(r, utils.topic_page_parser, max_entry, compact, keep_html, fields)
+
+
+async def get_entry(
+    entry_id: EntryID,
+    compact: bool = False,
+    keep_html: bool = True,
+    fields: Optional[Iterable[str]] = None,
+) -> models.Entry:
+    """This function get Ekşi Sözlük entry asynchronously.
+
+    Arguments:
+    entry_id (int): Unique entry identity.
+    compact (bool=False): Parse entry as slotted models.CompactEntry.
+    keep_html (bool=True): Keep entry html, None if False.
+    fields (Iterable[str]|None): Entry fields to parse, others are None, all fields if None.
+
+    Returns:
+    models.Entry (class): Entry data class.
+    """
+
+    if not isinstance(entry_id, int):
+        raise TypeError
+
+    fields = utils.entry_fields(fields)
+
+    r = await request(constants.ENTRY_ROUTE.format(entry_id))
+
+    return utils.parse(r, utils.entry_page_parser, compact, keep_html, fields)
+
+
+async def get_author(nickname: Nickname) -> models.Author:
+    """This function get Ekşi Sözlük author asynchronously.
+
+    Arguments:
+    nickname (str): Unique author nickname.
+
+    Returns:
+    models.Author (class): Author data class.
+    """
+
+    r = await request(constants.AUTHOR_ROUTE.format(nickname))
+
+    return utils.parse(r, utils.author_page_parser)
+
+
+async def get_agenda(max_topic: Optional[int] = None, page: int = 1) -> AsyncIterator[models.Agenda]:
+    """This function get Ekşi Sözlük agenda (gündem) page asynchronously.
+
+    Arguments:
+    max_topic (int|None): Maximum number of topics get from agenda.
+    page (int=1): Specific topic agenda page.
+
+    Returns:
+    AsyncIterator[models.Agenda] (class): Agenda data classes.
+    """
+
+    r = await request(constants.AGENDA_ROUTE, params={"p": page})
+
+    for agenda in utils.parse(r, utils.agenda_page_parser, max_topic):
+        yield agenda
+
+
+async def get_debe() -> AsyncIterator[models.Debe]:
+    """This function get Ekşi Sözlük debe page asynchronously.
+
+    Returns:
+    AsyncIterator[models.Debe] (class): Entry data classes.
+    """
+
+    r = await request(constants.DEBE_ROUTE)
+
+    for debe in utils.parse(r, utils.debe_page_parser):
+        yield debe
+
+
+async def get_search_topic(keywords: SearchKeywords) -> AsyncIterator[models.SearchResult]:
+    """This function get Ekşi Sözlük search topic page asynchronously.
+
+    Arguments:
+    keywords (SearchKeywords): Search keywords.
+
+    Returns:
+    AsyncIterator[models.SearchResult] (class): SearchResult data classes.
+    """
+
+    r = await request(constants.SEARCH_ROUTE, params=utils.search_params(keywords))
+
+    for search_result in utils.parse(r, utils.search_page_parser):
+        yield search_result
+
+
+async def get_channel(
+    path: str,
+    max_topic: Optional[int] = None,
+    page: int = 1,
+) -> AsyncIterator[models.ChannelTopic]:
+    """This function get channel topics asynchronously.
+
+    Arguments:
+    path (str): Channel path.
+    max_topic (int|None): Maximum number of topics get from channel.
+    page (int=1): Specific channel page.
+
+    Returns:
+    AsyncIterator[models.ChannelTopic] (class): ChannelTopic data classes.
+    """
+
+    utils.check_channel(path)
+
+    r = await request(constants.CHANNEL_ROUTE.format(path), params={"p": page})
+
+    for channel_topic in utils.parse(r, utils.channel_page_parser, max_topic):
+        yield channel_topic
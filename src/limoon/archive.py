@@ -0,0 +1,170 @@
+import json
+import mmap
+import os
+import sqlite3
+import struct
+import threading
+import zlib
+from typing import Iterator, Optional
+
+from requests_html import HTMLResponse
+
+from . import utils
+
+
+# Record header: compressed length, then the compressed record
+RECORD_HEADER = struct.Struct("<I")
+
+SEGMENT_NAME = "{:08d}.seg"
+INDEX_NAME = "index.sqlite"
+
+
+class Archive:
+    """Append-only archive of raw responses for core.request, re-parse pages without fetching them.
+
+    In "record" mode every response downloaded by core.request is appended to the current
+    segment file, a new segment is started once it grows past segment_size. In "replay" mode
+    core.request answers from the archive only, through memory-mapped segments, and raises
+    NotArchived for pages never recorded. Recording a page again keeps the newest response.
+
+    Records are zlib compressed, an SQLite index maps request keys to segment offsets.
+
+    Arguments:
+    path (str): Archive directory, created if missing.
+    mode (str="record"): "record" or "replay".
+    segment_size (int=1 GiB): Segment size in bytes before a new one is started.
+    level (int=6): zlib compression level.
+    """
+
+    def __init__(self, path: str, mode: str = "record", segment_size: int = 1 << 30, level: int = 6):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown mode {mode!r}, expected 'record' or 'replay'")
+
+        os.makedirs(path, exist_ok=True)
+
+        self.path = path
+        self.mode = mode
+        self.segment_size = segment_size
+        self.level = level
+        self._lock = threading.Lock()
+        self._maps: dict[int, mmap.mmap] = {}
+        self._file = None
+        self._connection = sqlite3.connect(os.path.join(path, INDEX_NAME), check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS records (key TEXT PRIMARY KEY, segment INTEGER, offset INTEGER, length INTEGER)"
+        )
+        self._connection.commit()
+
+        segments = [int(name.split(".")[0]) for name in os.listdir(path) if name.endswith(".seg")]
+        self._segment = max(segments, default=0)
+
+    def __repr__(self):
+        return f"Archive({self.path!r}, {self.mode!r})"
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM records").fetchone()[0]
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return self._connection.execute("SELECT 1 FROM records WHERE key = ?", (key,)).fetchone() is not None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    @property
+    def replay(self) -> bool:
+        return self.mode == "replay"
+
+    def append(self, key: str, response: HTMLResponse) -> None:
+        record = json.dumps(
+            [response.status_code, response.url, dict(response.headers), response.encoding],
+            ensure_ascii=False,
+        ).encode()
+        data = zlib.compress(record + b"\n" + response.content, self.level)
+
+        with self._lock:
+            if self._file is None or self._file.tell() >= self.segment_size:
+                self._open_segment()
+
+            offset = self._file.tell()
+            self._file.write(RECORD_HEADER.pack(len(data)) + data)
+            self._file.flush()
+            self._connection.execute(
+                "INSERT OR REPLACE INTO records VALUES (?, ?, ?, ?)",
+                (key, self._segment, offset + RECORD_HEADER.size, len(data)),
+            )
+            self._connection.commit()
+
+    def get(self, key: str) -> Optional[HTMLResponse]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT segment, offset, length FROM records WHERE key = ?",
+                (key,),
+            ).fetchone()
+
+        return None if row is None else self._read(*row)
+
+    def responses(self) -> Iterator[tuple[str, HTMLResponse]]:
+        """Yield every archived key and response in segment order, reading segments sequentially."""
+
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT key, segment, offset, length FROM records ORDER BY segment, offset"
+            ).fetchall()
+
+        for key, segment, offset, length in rows:
+            yield key, self._read(segment, offset, length)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+            for segment in self._maps.values():
+                segment.close()
+
+            self._maps.clear()
+            self._connection.close()
+
+    def _open_segment(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._segment += 1
+        elif os.path.exists(self._segment_path(self._segment)) and (
+            os.path.getsize(self._segment_path(self._segment)) >= self.segment_size
+        ):
+            self._segment += 1
+
+        self._file = open(self._segment_path(self._segment), "ab")
+
+    def _segment_path(self, segment: int) -> str:
+        return os.path.join(self.path, SEGMENT_NAME.format(segment))
+
+    def _read(self, segment: int, offset: int, length: int) -> HTMLResponse:
+        with self._lock:
+            data = self._map(segment, offset + length)[offset : offset + length]
+
+        head, _, content = zlib.decompress(data).partition(b"\n")
+        status_code, url, headers, encoding = json.loads(head)
+
+        return utils.build_response(status_code, url, content, headers, encoding)
+
+    def _map(self, segment: int, end: int) -> mmap.mmap:
+        mapped = self._maps.get(segment)
+
+        # The segment being recorded grows, map it again to see the new records
+        if mapped is None or len(mapped) < end:
+            if mapped is not None:
+                mapped.close()
+
+            with open(self._segment_path(segment), "rb") as file:
+                mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+            self._maps[segment] = mapped
+
+        return mapped
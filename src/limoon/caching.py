@@ -0,0 +1,322 @@
+import json
+import re
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from http import HTTPStatus
+from typing import Optional
+
+from requests_html import HTMLResponse
+
+from . import constants, utils
+
+
+@dataclass
+class CacheStats:
+    """CacheStats data class.
+
+    Arguments:
+    hits (int): Requests answered from cache.
+    misses (int): Requests sent to network.
+    size (int): Cached response count.
+    """
+
+    hits: int
+    misses: int
+    size: int
+
+
+@dataclass
+class RequestStats:
+    """RequestStats data class.
+
+    Arguments:
+    cached (int): Requests answered from cache.
+    revalidated (int): Requests answered with 304 Not Modified.
+    downloaded (int): Requests downloaded in full.
+    replayed (int): Requests answered from an archive.Archive in replay mode.
+    """
+
+    cached: int = 0
+    revalidated: int = 0
+    downloaded: int = 0
+    replayed: int = 0
+
+
+class Cache(ABC):
+    """Base response cache for core.request.
+
+    Routes given with ttl are matched before constants.CACHE_TTL, the first matching route wins.
+
+    Arguments:
+    ttl (dict|None): Seconds to keep responses per route, merged over constants.CACHE_TTL.
+    default_ttl (float=60): Seconds to keep responses of unlisted routes.
+    """
+
+    def __init__(self, ttl: Optional[dict] = None, default_ttl: float = 60):
+        self.ttl = {**constants.CACHE_TTL, **(ttl or {})}
+        self.default_ttl = default_ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.RLock()
+        self._routes = [
+            (route_pattern(route), seconds)
+            for routes in (ttl or {}, constants.CACHE_TTL)
+            for route, seconds in routes.items()
+        ]
+
+    def ttl_for(self, endpoint: str) -> float:
+        for pattern, seconds in self._routes:
+            if pattern.fullmatch(endpoint):
+                return seconds
+
+        return self.default_ttl
+
+    def get(self, key: str) -> Optional[HTMLResponse]:
+        with self._lock:
+            response = self._get(key, time.time())
+
+            if response is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+
+            return response
+
+    def set(self, key: str, endpoint: str, response: HTMLResponse) -> None:
+        if response.status_code != HTTPStatus.OK:
+            return
+
+        ttl = self.ttl_for(endpoint)
+
+        if ttl <= 0:
+            return
+
+        with self._lock:
+            self._set(key, response, time.time() + ttl)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._clear()
+
+    @property
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(self.hits, self.misses, len(self))
+
+    @abstractmethod
+    def _get(self, key: str, now: float) -> Optional[HTMLResponse]:
+        pass
+
+    @abstractmethod
+    def _set(self, key: str, response: HTMLResponse, expires: float) -> None:
+        pass
+
+    @abstractmethod
+    def _clear(self) -> None:
+        pass
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+
+class MemoryCache(Cache):
+    """In-memory LRU response cache.
+
+    Arguments:
+    maxsize (int=1024): Maximum cached response count.
+    ttl (dict|None): Seconds to keep responses per route.
+    default_ttl (float=60): Seconds to keep responses of unlisted routes.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[dict] = None, default_ttl: float = 60):
+        super().__init__(ttl, default_ttl)
+        self.maxsize = maxsize
+        self._responses = OrderedDict()
+
+    def _get(self, key: str, now: float) -> Optional[HTMLResponse]:
+        try:
+            expires, response = self._responses[key]
+        except KeyError:
+            return None
+
+        if expires < now:
+            del self._responses[key]
+            return None
+
+        self._responses.move_to_end(key)
+        return response
+
+    def _set(self, key: str, response: HTMLResponse, expires: float) -> None:
+        self._responses[key] = (expires, response)
+        self._responses.move_to_end(key)
+
+        while len(self._responses) > self.maxsize:
+            self._responses.popitem(last=False)
+
+    def _clear(self) -> None:
+        self._responses.clear()
+
+    def __len__(self) -> int:
+        return len(self._responses)
+
+
+class SQLiteCache(Cache):
+    """On-disk SQLite response cache, survives restarts.
+
+    Arguments:
+    path (str): SQLite database file path.
+    maxsize (int|None): Maximum cached response count, least recently used removed first.
+    ttl (dict|None): Seconds to keep responses per route.
+    default_ttl (float=60): Seconds to keep responses of unlisted routes.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        maxsize: Optional[int] = None,
+        ttl: Optional[dict] = None,
+        default_ttl: float = 60,
+    ):
+        super().__init__(ttl, default_ttl)
+        self.path = path
+        self.maxsize = maxsize
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, expires REAL, accessed REAL, status_code INTEGER, "
+            "url TEXT, headers TEXT, content BLOB, encoding TEXT)"
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+        self._connection.commit()
+
+    def _get(self, key: str, now: float) -> Optional[HTMLResponse]:
+        row = self._connection.execute(
+            "SELECT expires, status_code, url, headers, content, encoding FROM responses WHERE key = ?",
+            (key,),
+        ).fetchone()
+
+        if row is None:
+            return None
+
+        expires, status_code, url, headers, content, encoding = row
+
+        if expires < now:
+            self._connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._connection.commit()
+            return None
+
+        if self.maxsize is not None:
+            self._connection.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            self._connection.commit()
+
+        return utils.build_response(status_code, url, content, json.loads(headers), encoding)
+
+    def _set(self, key: str, response: HTMLResponse, expires: float) -> None:
+        now = time.time()
+
+        self._connection.execute(
+            "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                key,
+                expires,
+                now,
+                response.status_code,
+                response.url,
+                json.dumps(dict(response.headers)),
+                response.content,
+                response.encoding,
+            ),
+        )
+        self._connection.execute("DELETE FROM responses WHERE expires < ?", (now,))
+
+        if self.maxsize is not None:
+            self._connection.execute(
+                "DELETE FROM responses WHERE key IN "
+                "(SELECT key FROM responses ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                (self.maxsize,),
+            )
+
+        self._connection.commit()
+
+    def _clear(self) -> None:
+        self._connection.execute("DELETE FROM responses")
+        self._connection.commit()
+
+    def __len__(self) -> int:
+        return self._connection.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+
+class Revalidator:
+    """Remembers ETag and Last-Modified per URL to send conditional requests.
+
+    Responses answered with 304 Not Modified are replaced by the stored response, so the
+    models parsed from it are reused too.
+
+    Arguments:
+    maxsize (int=1024): Maximum remembered response count, least recently used removed first.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self.revalidated = 0
+        self.downloaded = 0
+        self._lock = threading.Lock()
+        self._responses = OrderedDict()
+
+    def headers(self, key: str) -> dict:
+        with self._lock:
+            response = self._responses.get(key)
+
+        if response is None:
+            return {}
+
+        headers = {}
+
+        if "ETag" in response.headers:
+            headers["If-None-Match"] = response.headers["ETag"]
+        if "Last-Modified" in response.headers:
+            headers["If-Modified-Since"] = response.headers["Last-Modified"]
+
+        return headers
+
+    def update(self, key: str, response: HTMLResponse) -> HTMLResponse:
+        with self._lock:
+            if response.status_code == HTTPStatus.NOT_MODIFIED and key in self._responses:
+                self.revalidated += 1
+                stored = self._responses[key]
+                self._responses.move_to_end(key)
+
+                for name in ("ETag", "Last-Modified"):
+                    if name in response.headers:
+                        stored.headers[name] = response.headers[name]
+
+                return stored
+
+            self.downloaded += 1
+
+            if response.status_code == HTTPStatus.OK and (
+                "ETag" in response.headers or "Last-Modified" in response.headers
+            ):
+                response.models = {}
+                self._responses[key] = response
+                self._responses.move_to_end(key)
+
+                while len(self._responses) > self.maxsize:
+                    self._responses.popitem(last=False)
+
+            return response
+
+    def clear(self) -> None:
+        with self._lock:
+            self._responses.clear()
+
+
+def route_pattern(route: str) -> re.Pattern:
+    """Compile route, a "{}" placeholder matches a single path segment."""
+
+    return re.compile(re.escape(route).replace(re.escape("{}"), "[^/?]+"))
@@ -0,0 +1,158 @@
+import functools
+import threading
+import types
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+from curl_adapter import CurlCffiAdapter
+from curl_cffi.curl import CurlOpt
+from requests_html import HTMLSession
+
+
+class PooledCurlCffiAdapter(CurlCffiAdapter):
+    """CurlCffiAdapter keeping up to pool_size connections alive per curl handle."""
+
+    def __init__(self, pool_size: int = 10, **kwargs):
+        super().__init__(**kwargs)
+        self.pool_size = pool_size
+
+    def set_curl_options(self, curl, *args, **kwargs):
+        super().set_curl_options(curl, *args, **kwargs)
+        curl.setopt(CurlOpt.MAXCONNECTS, self.pool_size)
+        curl.setopt(CurlOpt.TCP_KEEPALIVE, 1)
+
+
+class Client:
+    """Client owning its own session, core functions are available as its methods.
+
+    Arguments:
+    base_url (str|None): Ekşi Sözlük base URL, constants.BASE_URL if None.
+    timeout (float|None): Request timeout seconds, constants.TIMEOUT if None.
+    pool_size (int=10): Connections kept alive per session.
+    http2 (bool=True): Use HTTP/2 multiplexing.
+    headers (dict|None): Headers merged over constants.HEADERS.
+    per_thread (bool=False): Create a separate session for each thread.
+    impersonate (str="chrome"): Browser TLS fingerprint for curl_cffi.
+    """
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        timeout: Optional[float] = None,
+        pool_size: int = 10,
+        http2: bool = True,
+        headers: Optional[dict] = None,
+        per_thread: bool = False,
+        impersonate: str = "chrome",
+    ):
+        self.base_url = base_url
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self.http2 = http2
+        self.headers = headers or {}
+        self.per_thread = per_thread
+        self.impersonate = impersonate
+        self._session = None
+        self._sessions = []
+        self._local = threading.local()
+        self._lock = threading.RLock()
+
+    def __repr__(self):
+        return f"Client({self.base_url!r})"
+
+    def __getattr__(self, name: str) -> Callable:
+        from . import core
+
+        func = getattr(core, name, None)
+
+        if (
+            name.startswith("_")
+            or name in ("get_client", "get_session", "use_client")
+            or not isinstance(func, types.FunctionType)
+            or func.__module__ != core.__name__
+        ):
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+        return self._bind(func)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    @property
+    def session(self) -> HTMLSession:
+        if self.per_thread:
+            session = getattr(self._local, "session", None)
+
+            if session is None:
+                session = self._local.session = self.new_session()
+
+            return session
+
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = self.new_session()
+
+        return self._session
+
+    def new_session(self) -> HTMLSession:
+        session = HTMLSession()
+        adapter = PooledCurlCffiAdapter(
+            pool_size=self.pool_size,
+            impersonate_browser_type=self.impersonate,
+            http_version="v2" if self.http2 else "v1",
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+
+        with self._lock:
+            self._sessions.append(session)
+
+        return session
+
+    def close(self) -> None:
+        with self._lock:
+            sessions, self._sessions = self._sessions, []
+            self._session = None
+            self._local = threading.local()
+
+        for session in sessions:
+            session.close()
+
+    @contextmanager
+    def use(self) -> Iterator["Client"]:
+        """Make core functions called inside the block use this client."""
+
+        from . import core
+
+        with core.use_client(self):
+            yield self
+
+    def _bind(self, func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with self.use():
+                result = func(*args, **kwargs)
+
+            if isinstance(result, types.GeneratorType):
+                return self._iterate(result)
+            return result
+
+        return wrapper
+
+    def _iterate(self, generator: types.GeneratorType) -> Iterator:
+        try:
+            while True:
+                with self.use():
+                    try:
+                        item = next(generator)
+                    except StopIteration:
+                        return
+
+                yield item
+        finally:
+            with self.use():
+                generator.close()
@@ -1,7 +1,5 @@
 from typing import Final
 
-from fake_useragent import UserAgent
-
 from .models import Channel
 
 
@@ -9,13 +7,6 @@ from .models import Channel
 BASE_URL = "https://eksisozluk.com"
 CDN_URL = "https://cdn.eksisozluk.com"
 
-HEADERS = {
-    "User-Agent": UserAgent().random,
-    "X-Requested-With": "XMLHttpRequest",
-    "Accept-Encoding": "gzip, deflate, br, zstd",
-    "Accept-Language": "tr-TR,tr;q=0.8,en-US;q=0.5,en;q=0.3",
-    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-}
 
 # Ekşi Sözlük Routes
 TOPIC_ROUTE: Final = "/{}"
@@ -30,8 +21,32 @@ SEARCH_ROUTE: Final = "/basliklar/ara"
 IMAGE_ROUTE: Final = CDN_URL + "/{}/{}/{}/{}/{}.jpg"
 CHANNEL_ROUTE: Final = "/basliklar/kanal/{}"
 
+# Seconds to keep cached responses per route, first matching route wins
+CACHE_TTL = {
+    AGENDA_ROUTE: 30,
+    DEBE_ROUTE: 3 * 60 * 60,
+    SEARCH_ROUTE: 5 * 60,
+    CHANNEL_ROUTE: 60,
+    ENTRY_ROUTE: 10 * 60,
+    AUTHOR_LAST_ENTRYS_ROUTE: 60,
+    AUTHOR_TOPIC_ROUTE: 60 * 60,
+    AUTHOT_BADGES_ROUTE: 60 * 60,
+    AUTHOR_ROUTE: 10 * 60,
+    TOPIC_ROUTE: 60,
+}
+
 TOTAL_ENTRY_COUNT = 300_000_000
 
+# Request timeout seconds and retries of transient failures (429, 5xx, Cloudflare challenge)
+TIMEOUT = 30
+RETRIES = 3
+
+# Entry parser engine, "lxml" or "requests_html"
+PARSER_ENGINE = "lxml"
+
+# Maximum concurrent connections of the asyncio session
+AIO_MAX_CLIENTS = 100
+
 CHANNELS = [
     Channel("haber", "yurtta ve dünyada olan biten", "haber"),
     Channel(
@@ -123,3 +138,21 @@ CHANNELS = [
     Channel("yaşam", "hayatın içinden oluşlar, küçük detaylar", "yasam"),
     Channel("kripto", "dijital para dünyasına dair her şey", "kripto"),
 ]
+
+
+def __getattr__(name: str):
+    # HEADERS is built on first access, loading fake_useragent data only when a request is made
+    if name == "HEADERS":
+        from fake_useragent import UserAgent
+
+        global HEADERS
+        HEADERS = {
+            "User-Agent": UserAgent().random,
+            "X-Requested-With": "XMLHttpRequest",
+            "Accept-Encoding": "gzip, deflate, br, zstd",
+            "Accept-Language": "tr-TR,tr;q=0.8,en-US;q=0.5,en;q=0.3",
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+        }
+        return HEADERS
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,13 +1,19 @@
-import random
+import contextvars
+import itertools
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from contextlib import contextmanager
 from http import HTTPStatus
-from typing import Callable, Iterator, Optional, TypeVar, Union
+from typing import Callable, Iterable, Iterator, Optional, TypeVar, Union
 from urllib.parse import urlparse
 
 import requests
-from curl_adapter import CurlCffiAdapter
 from requests_html import HTMLResponse, HTMLSession
 
-from . import constants, exceptions, models, utils
+from . import caching, constants, exceptions, index, instrument, models, throttle, utils
+from .client import Client
 
 
 # Typings
@@ -16,18 +22,216 @@ TopicKeywords = TypeVar("TopicKeywords", Callable, str)
 Nickname = TypeVar("Nickname", Callable, str)
 SearchKeywords = TypeVar("SearchKeywords", Callable, str)
 
-# Session
-session = HTMLSession()
-session.mount("http://", CurlCffiAdapter())
-session.mount("https://", CurlCffiAdapter())
+# Client used by module functions when none is bound with use_client
+default_client: Optional[Client] = None
+
+_client = contextvars.ContextVar("client", default=None)
+_client_lock = threading.Lock()
+
+
+def get_client() -> Client:
+    """Return the client bound to the current context, or the default client."""
+
+    global default_client
+
+    client = _client.get()
+
+    if client is not None:
+        return client
+
+    if default_client is None:
+        with _client_lock:
+            if default_client is None:
+                default_client = Client()
+
+    return default_client
+
+
+@contextmanager
+def use_client(client: Client) -> Iterator[Client]:
+    """Make module functions called inside the block (and their worker threads) use client."""
+
+    token = _client.set(client)
+
+    try:
+        yield client
+    finally:
+        _client.reset(token)
+
+
+def get_session() -> HTMLSession:
+    """Return the session of the current client (or the one assigned to core.session)."""
+
+    if _client.get() is None and "session" in globals():
+        return session
+
+    return get_client().session
+
+
+def __getattr__(name: str):
+    if name == "session":
+        return get_client().session
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Response cache, e.g. caching.MemoryCache() or caching.SQLiteCache(path)
+cache = None
+
+# Conditional request validators, e.g. caching.Revalidator()
+revalidator = None
+
+# Raw response archive, e.g. archive.Archive(path) to record or archive.Archive(path, "replay")
+archive = None
+
+# Valid and missing entry identities used by get_random_entries, e.g. index.EntryIndex(path)
+entry_index = None
+
+# Concurrent identical requests share one in-flight request and parse result
+coalesce = True
+
+_flight = utils.SingleFlight()
+
+# Per host rate limiter shared by threads and limoon.aio, None to disable
+limiter = throttle.RateLimiter()
+
+_request_stats = contextvars.ContextVar("request_stats", default=())
+_request_stats_lock = threading.Lock()
+
+
+@contextmanager
+def request_stats() -> Iterator[caching.RequestStats]:
+    """Count how requests made inside the block were answered.
+
+    Returns:
+    caching.RequestStats (class): RequestStats data class, updated until the block exits.
+    """
+
+    stats = caching.RequestStats()
+    token = _request_stats.set(_request_stats.get() + (stats,))
+
+    try:
+        yield stats
+    finally:
+        _request_stats.reset(token)
+
+
+def _count(name: str) -> None:
+    with _request_stats_lock:
+        for stats in _request_stats.get():
+            setattr(stats, name, getattr(stats, name) + 1)
+
+
+def send(endpoint: str, params: dict = {}, headers: Optional[dict] = None) -> requests.Response:
+    """Send a request through the rate limiter, retrying transient failures with backoff."""
+
+    client = get_client()
+    url = (client.base_url or constants.BASE_URL) + endpoint
+    host = urlparse(url).netloc
+    headers = {**constants.HEADERS, **client.headers, **(headers or {})}
+    timeout = constants.TIMEOUT if client.timeout is None else client.timeout
+
+    for attempt in range(constants.RETRIES + 1):
+        if limiter is not None:
+            limiter.wait(host)
+
+        hooks = instrument.hooks
+
+        if hooks is not None:
+            hooks.request_start(url)
+            start = time.perf_counter()
+
+        try:
+            r = get_session().get(url, params=params, headers=headers, timeout=timeout)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            if hooks is not None:
+                hooks.request_end(
+                    instrument.RequestEvent(url, None, 0, time.perf_counter() - start, attempt, error=type(e).__name__)
+                )
+            if limiter is not None:
+                limiter.failure(host)
+            if attempt == constants.RETRIES:
+                raise
+            time.sleep(throttle.backoff(attempt))
+            continue
+
+        if hooks is not None:
+            hooks.request_end(
+                instrument.RequestEvent(
+                    url,
+                    r.status_code,
+                    len(r.content),
+                    time.perf_counter() - start,
+                    attempt,
+                    instrument.timings(getattr(r, "curl_info", None)),
+                )
+            )
+
+        if not throttle.is_transient(r.status_code, r.headers, r.content):
+            if limiter is not None:
+                limiter.success(host)
+            return r
+
+        if limiter is not None:
+            limiter.failure(host)
+        if attempt < constants.RETRIES:
+            time.sleep(throttle.backoff(attempt, r.headers.get("Retry-After")))
+
+    if r.status_code == HTTPStatus.TOO_MANY_REQUESTS or throttle.is_challenge(r.status_code, r.headers, r.content):
+        raise exceptions.RateLimited()
+
+    return r
 
 
 def request(endpoint: str, headers: dict = {}, params: dict = {}) -> requests.Response:
-    return session.get(
-        constants.BASE_URL + endpoint,
-        params=params,
-        headers=constants.HEADERS,
-    )
+    """Request endpoint, concurrent identical requests share one response when coalesce is set."""
+
+    if not coalesce:
+        return _request(endpoint, params)
+
+    client = get_client()
+    key = (id(client), utils.request_key((client.base_url or constants.BASE_URL) + endpoint, params))
+
+    return _flight.do(key, _request, endpoint, params, on_shared=utils.memoize)
+
+
+def _request(endpoint: str, params: dict) -> requests.Response:
+    if cache is None and revalidator is None and archive is None:
+        _count("downloaded")
+        return send(endpoint, params)
+
+    key = utils.request_key((get_client().base_url or constants.BASE_URL) + endpoint, params)
+
+    if archive is not None and archive.replay:
+        r = archive.get(key)
+
+        if r is None:
+            raise exceptions.NotArchived(key)
+
+        _count("replayed")
+        return r
+
+    r = None if cache is None else cache.get(key)
+
+    if r is not None:
+        _count("cached")
+        return r
+
+    r = send(endpoint, params, revalidator.headers(key) if revalidator else None)
+
+    _count("revalidated" if r.status_code == HTTPStatus.NOT_MODIFIED else "downloaded")
+
+    if archive is not None and r.status_code != HTTPStatus.NOT_MODIFIED:
+        archive.append(key, r)
+
+    if revalidator is not None:
+        r = revalidator.update(key, r)
+
+    if cache is not None:
+        utils.memoize(r)
+        cache.set(key, endpoint, r)
+
+    return r
 
 
 def get_topic(
@@ -37,6 +241,9 @@ def get_topic(
     day: Optional[str] = None,
     author: Optional[str] = None,
     max_entry: Optional[int] = None,
+    compact: bool = False,
+    keep_html: bool = True,
+    fields: Optional[Iterable[str]] = None,
 ) -> models.Topic:
     """This function get Ekşi Sözlük topic.
 
@@ -47,56 +254,109 @@ def get_topic(
     day (str|None): Specific entry day.
     author (str|None): Specific author nickname.
     max_entry (int|None): Max entry per topic.
+    compact (bool=False): Parse entrys as slotted models.CompactEntry.
+    keep_html (bool=True): Keep entry html, None if False.
+    fields (Iterable[str]|None): Entry fields to parse, others are None, all fields if None.
 
     Returns:
     models.Topic (class): Topic data class.
     """
 
-    if not isinstance(page, int):
-        raise TypeError
+    fields = utils.entry_fields(fields)
 
-    params = {"p": page}
+    r = request(
+        constants.TOPIC_ROUTE.format(topic_keywords),
+        params=utils.topic_params(page, action, day, author),
+    )
 
-    if action in ("nice", "dailynice", "popular", "search"):
-        params["a"] = action
+    return utils.parse(r, utils.topic_page_parser, max_entry, compact, keep_html, fields)
 
-    if day:
-        params["day"] = day
 
-    if author:
-        params["author"] = author
+def get_topic_pages(
+    topic_keywords: TopicKeywords,
+    pages: Optional[int] = None,
+    workers: int = 4,
+    action: Optional[str] = None,
+    day: Optional[str] = None,
+    author: Optional[str] = None,
+    compact: bool = False,
+    keep_html: bool = True,
+    processes: Union[int, Executor, None] = None,
+    fields: Optional[Iterable[str]] = None,
+) -> Iterator[models.Entry]:
+    """This function get Ekşi Sözlük topic entrys across pages concurrently.
 
-    r = request(
-        constants.TOPIC_ROUTE.format(topic_keywords),
-        params=params,
-    )
+    Arguments:
+    topic_keywords (str): Keywords (or path) of topic to be get.
+    pages (int|None): Maximum number of pages to get, all pages if None.
+    workers (int=4): Number of pages fetched at the same time.
+    action (str|None): Nice or popular.
+    day (str|None): Specific entry day.
+    author (str|None): Specific author nickname.
+    compact (bool=False): Parse entrys as slotted models.CompactEntry.
+    keep_html (bool=True): Keep entry html, None if False.
+    processes (int|Executor|None): Parse pages in this many processes (or this executor), in threads if None.
+    fields (Iterable[str]|None): Entry fields to parse, others are None, all fields if None.
 
-    if r.status_code == HTTPStatus.NOT_FOUND:
-        raise exceptions.TopicNotFound()
+    Returns:
+    Iterator[models.Entry] (class): Entry data classes in page order.
+    """
 
-    try:
-        h1 = r.html.find("h1#title", first=True)
-        path = h1.find("a", first=True).attrs["href"]
-        page_count = r.html.find("div.pager", first=True)
-        pinned_entry = r.html.find("div#pinned-entry", first=True)
-
-        return models.Topic(
-            int(h1.attrs["data-id"]),
-            h1.attrs["data-title"],
-            path[1:],
-            utils.entry_parser(r.html, max_entry),
-            utils.pinned_entry_parser(r.html, pinned_entry) if pinned_entry else False,
-            0 if page_count is None else int(page_count.attrs["data-pagecount"]),
-        )
-    except AttributeError as e:
-        raise exceptions.ElementNotFound(message=f"Failed to parse topic page: {e}", html=r.html.html)
+    fields = utils.entry_fields(fields)
+    options = dict(action=action, day=day, author=author, compact=compact, keep_html=keep_html, fields=fields)
+    topic = get_topic(topic_keywords, **options)
+
+    yield from topic.entrys
+
+    page_count = topic.page_count if pages is None else min(pages, topic.page_count)
+
+    if processes is None:
+
+        def fetch_page(page: int) -> list[models.Entry]:
+            return list(get_topic(topic.path, page=page, **options).entrys)
+
+        for entrys in utils.bounded_map(fetch_page, range(2, page_count + 1), workers=workers):
+            yield from entrys
+
+        return
+
+    entry_class = models.CompactEntry if compact else models.Entry
 
+    # Workers are spawned, forking while fetch threads hold locks could deadlock the children
+    if isinstance(processes, int):
+        executor = ProcessPoolExecutor(processes, mp_context=multiprocessing.get_context("spawn"))
+    else:
+        executor = processes
 
-def get_entry(entry_id: EntryID) -> models.Entry:
+    def fetch_page_args(page: int) -> Future:
+        r = request(
+            constants.TOPIC_ROUTE.format(topic.path),
+            params=utils.topic_params(page, action, day, author),
+        )
+        return executor.submit(utils.topic_entry_args, r.status_code, r.url, r.content, keep_html, fields)
+
+    try:
+        for future in utils.bounded_map(fetch_page_args, range(2, page_count + 1), workers=workers):
+            for args in future.result():
+                yield entry_class(*args)
+    finally:
+        if executor is not processes:
+            executor.shutdown(cancel_futures=True)
+
+
+def get_entry(
+    entry_id: EntryID,
+    compact: bool = False,
+    keep_html: bool = True,
+    fields: Optional[Iterable[str]] = None,
+) -> models.Entry:
     """This function get Ekşi Sözlük entry.
 
     Arguments:
     entry_id (int): Unique entry identity.
+    compact (bool=False): Parse entry as slotted models.CompactEntry.
+    keep_html (bool=True): Keep entry html, None if False.
+    fields (Iterable[str]|None): Entry fields to parse, others are None, all fields if None.
 
     Returns:
     models.Entry (class): Entry data class.
@@ -105,17 +365,49 @@ def get_entry(entry_id: EntryID) -> models.Entry:
     if not isinstance(entry_id, int):
         raise TypeError
 
+    fields = utils.entry_fields(fields)
+
     r = request(constants.ENTRY_ROUTE.format(entry_id))
 
-    if r.status_code == HTTPStatus.NOT_FOUND:
-        raise exceptions.EntryNotFound()
-    if r.html.find("h1", first=True).text == exceptions.SHIT_MESSAGE:
-        raise exceptions.EntryNotFound()
+    return utils.parse(r, utils.entry_page_parser, compact, keep_html, fields)
 
-    try:
-        return next(utils.entry_parser(r.html))
-    except AttributeError as e:
-        raise exceptions.ElementNotFound(message=f"Failed to parse entry page: {e}", html=r.html.html)
+
+def get_entries(
+    entry_ids: Iterable[EntryID],
+    workers: int = 4,
+    ordered: bool = True,
+    compact: bool = False,
+    keep_html: bool = True,
+    fields: Optional[Iterable[str]] = None,
+) -> Iterator[tuple[int, Union[models.Entry, exceptions.EntryNotFound]]]:
+    """This function get Ekşi Sözlük entrys concurrently.
+
+    Repeated ids are fetched once, an entry not found is yielded as its EntryNotFound
+    instead of stopping the batch.
+
+    Arguments:
+    entry_ids (Iterable[int]): Unique entry identities, e.g. models.Debe.id values.
+    workers (int=4): Number of entrys fetched at the same time.
+    ordered (bool=True): Yield in entry_ids order, as fetched otherwise.
+    compact (bool=False): Parse entrys as slotted models.CompactEntry.
+    keep_html (bool=True): Keep entry html, None if False.
+    fields (Iterable[str]|None): Entry fields to parse, others are None, all fields if None.
+
+    Returns:
+    Iterator[tuple[int, models.Entry|EntryNotFound]] (class): Entry identity and data class pairs.
+    """
+
+    def fetch_entry(entry_id: int) -> tuple[int, Union[models.Entry, exceptions.EntryNotFound]]:
+        try:
+            return entry_id, get_entry(entry_id, compact, keep_html, fields)
+        except exceptions.EntryNotFound as e:
+            return entry_id, e
+
+    fields = utils.entry_fields(fields)
+
+    entry_ids = dict.fromkeys(int(entry_id) for entry_id in entry_ids)
+
+    yield from utils.bounded_map(fetch_entry, entry_ids, workers=workers, ordered=ordered)
 
 
 def get_author(nickname: Nickname) -> models.Author:
@@ -130,47 +422,22 @@ def get_author(nickname: Nickname) -> models.Author:
 
     r = request(constants.AUTHOR_ROUTE.format(nickname))
 
-    if r.status_code == HTTPStatus.NOT_FOUND:
-        raise exceptions.AuthorNotFound()
-
-    try:
-        nickname = r.html.find("h1#user-profile-title", first=True)
-        biography = r.html.find("div#profile-biography", first=True)
-        total_entry = r.html.find("span#entry-count-total", first=True)
-        follower_count = r.html.find("span#user-follower-count", first=True)
-        following_count = r.html.find("span#user-following-count", first=True)
-        record_date = r.html.find("div.recorddate", first=True)
-        avatar_url = r.html.find("img.avatar", first=True)
-        rank = r.html.find("p.muted", first=True)
-
-        return models.Author(
-            nickname.attrs["data-nick"],
-            biography.text if biography else biography,
-            biography.html if biography else biography,
-            int(total_entry.text),
-            int(follower_count.text),
-            int(following_count.text),
-            record_date.text.title(),
-            avatar_url.attrs["src"],
-            rank,
-        )
-    except AttributeError as e:
-        raise exceptions.ElementNotFound(message=f"Failed to parse author page: {e}", html=r.html.html)
+    return utils.parse(r, utils.author_page_parser)
 
 
-def get_author_rank(nickname: Nickname) -> models.Rank:
-    """This function get Ekşi Sözlük author rank.
+def get_author_rank(nickname: Nickname) -> Optional[models.Rank]:
+    """This function get Ekşi Sözlük author rank, parsing only the rank of the author page.
 
     Arguments:
     nickname (str): Unique author nickname.
 
     Returns:
-    models.Rank (class): Rank data class.
+    models.Rank (class|None): Rank data class.
     """
 
-    author = get_author(nickname)
+    r = request(constants.AUTHOR_ROUTE.format(nickname))
 
-    return models.Rank(name=author.rank.name, karma=author.rank.karma)
+    return utils.parse(r, utils.rank_page_parser)
 
 
 def get_author_badges(nickname: Nickname) -> Iterator[models.Badge]:
@@ -185,16 +452,7 @@ def get_author_badges(nickname: Nickname) -> Iterator[models.Badge]:
 
     r = request(constants.AUTHOT_BADGES_ROUTE.format(nickname))
 
-    try:
-        for badge in r.html.find("li.badge-item-otheruser"):
-            if badge.attrs["data-owned"] != "False":
-                yield models.Badge(
-                    badge.find("p", first=True).text,
-                    badge.find("a", first=True).attrs["data-title"],
-                    badge.find("img", first=True).attrs["src"],
-                )
-    except AttributeError as e:
-        raise exceptions.ElementNotFound(message=f"Failed to parse author badges page: {e}", html=r.html.html)
+    yield from utils.parse(r, utils.badges_page_parser)
 
 
 def get_author_topic(nickname: Nickname) -> models.Topic:
@@ -209,15 +467,87 @@ def get_author_topic(nickname: Nickname) -> models.Topic:
 
     r = request(constants.AUTHOR_TOPIC_ROUTE.format(nickname))
 
-    return get_topic(urlparse(r.url).path[1:])
+    # The redirected response is the topic page itself
+    return utils.parse(r, utils.topic_page_parser)
+
+
+AUTHOR_PROFILE_SECTIONS = ("author", "rank", "badges", "topic")
+
+
+def get_author_profile(
+    nickname: Nickname,
+    include: Iterable[str] = AUTHOR_PROFILE_SECTIONS,
+    workers: int = 4,
+) -> models.AuthorProfile:
+    """This function get Ekşi Sözlük author profile sections, fetching their pages concurrently.
+
+    Author and rank share a single request, only the included sections are parsed.
+
+    Arguments:
+    nickname (str): Unique author nickname.
+    include (Iterable[str]): Sections from "author", "rank", "badges" and "topic".
+    workers (int=4): Number of pages fetched at the same time.
+
+    Returns:
+    models.AuthorProfile (class): AuthorProfile data class.
+    """
+
+    include = set(include)
+
+    if not include <= set(AUTHOR_PROFILE_SECTIONS):
+        raise ValueError(
+            f"Unknown author profile sections: {', '.join(sorted(include - set(AUTHOR_PROFILE_SECTIONS)))}"
+        )
+
+    routes = {}
+
+    if include & {"author", "rank"}:
+        routes["author"] = constants.AUTHOR_ROUTE.format(nickname)
+    if "badges" in include:
+        routes["badges"] = constants.AUTHOT_BADGES_ROUTE.format(nickname)
+    if "topic" in include:
+        routes["topic"] = constants.AUTHOR_TOPIC_ROUTE.format(nickname)
+
+    responses = dict(zip(routes, utils.bounded_map(request, routes.values(), workers=workers)))
+    profile = models.AuthorProfile(nickname)
+
+    if "author" in include:
+        profile.author = utils.parse(responses["author"], utils.author_page_parser)
+        profile.rank = profile.author.rank
+    elif "rank" in include:
+        profile.rank = utils.parse(responses["author"], utils.rank_page_parser)
+
+    if "badges" in include:
+        profile.badges = list(utils.parse(responses["badges"], utils.badges_page_parser))
 
+    if "topic" in include:
+        try:
+            profile.topic = utils.parse(responses["topic"], utils.topic_page_parser)
+        except exceptions.TopicNotFound:
+            pass
 
-def get_author_last_entrys(nickname: Nickname, page: int = 1) -> Optional[Iterator[models.Entry]]:
+    if "rank" not in include:
+        profile.rank = None
+
+    return profile
+
+
+def get_author_last_entrys(
+    nickname: Nickname,
+    page: int = 1,
+    fallback: bool = False,
+    workers: int = 4,
+) -> Optional[Iterator[models.Entry]]:
     """This function get Ekşi Sözlük author last entrys.
 
+    Entrys are parsed from the last entrys page itself, so a page costs a single request.
+    Fallback entrys deleted before their own page is requested are skipped.
+
     Arguments:
     nickname (str): Unique author nickname.
     page (int=1): Specific last entrys page.
+    fallback (bool=False): Get entrys with incomplete markup from their own page.
+    workers (int=4): Number of fallback entrys fetched at the same time.
 
     Returns:
     Iterator[models.Entry] (class|None): Entry data class.
@@ -228,16 +558,27 @@ def get_author_last_entrys(nickname: Nickname, page: int = 1) -> Optional[Iterat
         params={"nick": nickname, "p": page},
     )
 
-    try:
-        topic_list = r.html.find("div#topic", first=True)
+    entrys = utils.parse(r, utils.last_entrys_page_parser, fallback)
 
-        if topic_list is None:
-            return None
+    if entrys is None:
+        return None
 
-        for topic in topic_list.find("div.topic-item"):
-            yield get_entry(int(topic.find("li#entry-item", first=True).attrs["data-id"]))
-    except AttributeError as e:
-        raise exceptions.ElementNotFound(message=f"Failed to parse author last entrys page: {e}", html=r.html.html)
+    missing = [entry for entry in entrys if isinstance(entry, int)]
+    fetched = dict(zip(missing, utils.bounded_map(_get_fallback_entry, missing, workers=workers)))
+
+    for entry in entrys:
+        if isinstance(entry, int):
+            entry = fetched[entry]
+
+        if entry is not None:
+            yield entry
+
+
+def _get_fallback_entry(entry_id: EntryID) -> Optional[models.Entry]:
+    try:
+        return get_entry(entry_id)
+    except exceptions.EntryNotFound:
+        return None
 
 
 def get_agenda(max_topic: Optional[int] = None, page: int = 1) -> Iterator[models.Agenda]:
@@ -253,27 +594,32 @@ def get_agenda(max_topic: Optional[int] = None, page: int = 1) -> Iterator[model
 
     r = request(constants.AGENDA_ROUTE, params={"p": page})
 
-    if r.status_code != HTTPStatus.OK:
-        raise exceptions.TopicNotFound()
+    yield from utils.parse(r, utils.agenda_page_parser, max_topic)
 
-    try:
-        topic_list = r.html.find("ul.topic-list", first=True).find("a")
 
-        for topic in topic_list[:max_topic]:
-            try:
-                a_class = topic.attrs["class"]
-                is_pinned = True if a_class == "pinned" else False
-            except KeyError:
-                is_pinned = False
-
-            yield models.Agenda(
-                topic.element.xpath("text()")[0].strip(),
-                urlparse(topic.attrs["href"]).path.split("/")[-1],
-                is_pinned,
-                topic.find("small", first=True).text,
-            )
-    except AttributeError as e:
-        raise exceptions.ElementNotFound(message=f"Failed to parse agenda page: {e}", html=r.html.html)
+def get_agenda_pages(
+    max_topic: Optional[int] = None,
+    pages: Optional[int] = None,
+    workers: int = 2,
+) -> Iterator[models.Agenda]:
+    """This function get Ekşi Sözlük agenda (gündem) topics across pages, see paginate.
+
+    Arguments:
+    max_topic (int|None): Maximum number of topics get from agenda.
+    pages (int|None): Maximum number of pages to get, until the last page if None.
+    workers (int=2): Number of pages fetched in the background.
+
+    Returns:
+    Iterator[models.Agenda] (class): Agenda data classes.
+    """
+
+    yield from paginate(
+        lambda page: request(constants.AGENDA_ROUTE, params={"p": page}),
+        utils.agenda_page_parser,
+        max_topic,
+        pages,
+        workers,
+    )
 
 
 def get_debe() -> Iterator[models.Debe]:
@@ -285,19 +631,7 @@ def get_debe() -> Iterator[models.Debe]:
 
     r = request(constants.DEBE_ROUTE)
 
-    if r.status_code != HTTPStatus.OK:
-        raise exceptions.EntryNotFound()
-
-    try:
-        entry_list = r.html.find("ul.topic-list", first=True).find("a")
-
-        for entry in entry_list:
-            yield models.Debe(
-                entry.find("span.caption", first=True).text,
-                urlparse(entry.attrs["href"]).path.split("/")[-1],
-            )
-    except AttributeError as e:
-        raise exceptions.ElementNotFound(message=f"Failed to parse debe page: {e}", html=r.html.html)
+    yield from utils.parse(r, utils.debe_page_parser)
 
 
 def get_search_topic(keywords: SearchKeywords) -> Iterator[models.SearchResult]:
@@ -310,68 +644,196 @@ def get_search_topic(keywords: SearchKeywords) -> Iterator[models.SearchResult]:
     Iterator[models.SearchResult] (class): SearchResult data classes.
     """
 
-    r = request(
-        constants.SEARCH_ROUTE,
-        params={
-            "SearchForm.Keywords": keywords,
-            "SearchForm.NiceOnly": "false",
-            "SearchForm.SortOrder": "Count",
-        },
-    )
+    r = request(constants.SEARCH_ROUTE, params=utils.search_params(keywords))
 
-    topic_ul = r.html.find("ul.topic-list", first=True)
+    yield from utils.parse(r, utils.search_page_parser)
 
-    if not topic_ul:
-        raise exceptions.SearchResultNotFound()
 
-    try:
-        topic_list = topic_ul.find("a")
+def get_random_entry() -> models.Entry:
+    """This function get random entry, see get_random_entries.
 
-        for topic in topic_list:
-            yield models.SearchResult(
-                topic.element.xpath("text()")[0].strip(),
-                urlparse(topic.attrs["href"]).path.split("/")[-1],
-                topic.find("small", first=True).text if topic.find("small", first=True) else None,
-            )
-    except AttributeError as e:
-        raise exceptions.ElementNotFound(message=f"Failed to parse search topic page: {e}", html=r.html.html)
+    Returns:
+    models.Entry (class): Entry data classes.
+    """
 
+    return next(get_random_entries(1))
 
-def get_random_entry() -> models.Entry:
-    """This function get random entry.
+
+def get_random_entries(
+    n: int,
+    workers: int = 4,
+    max_requests: Optional[int] = None,
+    compact: bool = False,
+    keep_html: bool = True,
+    fields: Optional[Iterable[str]] = None,
+) -> Iterator[models.Entry]:
+    """This function get n distinct random entrys concurrently.
+
+    Identities are drawn from core.entry_index (an in-memory index.EntryIndex if None),
+    skipping ones known to be missing. Every fetched identity is recorded in it, as are the
+    debe entrys while no valid one is known, so the sampling range follows the real highest
+    identity instead of constants.TOTAL_ENTRY_COUNT.
+
+    Arguments:
+    n (int): Number of entrys.
+    workers (int=4): Number of entrys fetched at the same time.
+    max_requests (int|None): Raise EntryNotFound after this many requests, n * 20 if None.
+    compact (bool=False): Parse entrys as slotted models.CompactEntry.
+    keep_html (bool=True): Keep entry html, None if False.
+    fields (Iterable[str]|None): Entry fields to parse, others are None, all fields if None.
 
     Returns:
-    models.Entry (class): Entry data classes.
+    Iterator[models.Entry] (class): Entry data classes as they are fetched.
     """
 
-    return get_entry(random.randint(1, constants.TOTAL_ENTRY_COUNT))
+    global entry_index
+
+    if entry_index is None:
+        entry_index = index.EntryIndex()
+
+    known = entry_index
+    fields = utils.entry_fields(fields)
+    max_requests = n * 20 if max_requests is None else max_requests
+
+    if known.max_id is None:
+        known.observe_entrys(int(debe.id) for debe in get_debe())
+
+    def fetch_entry(entry_id: int) -> Optional[models.Entry]:
+        try:
+            entry = get_entry(entry_id, compact, keep_html, fields)
+        except exceptions.EntryNotFound:
+            known.observe(entry_id, found=False)
+            return None
+
+        known.observe(entry_id)
+        return entry
+
+    tried, count, found = set(), 0, 0
+
+    try:
+        while count < n:
+            # Oversample by the hit rate so far, within what is left of max_requests
+            hit_rate = max(found / len(tried), 0.1) if tried else 1.0
+            size = min(round((n - count) / hit_rate), max_requests - len(tried))
+            entry_ids = known.sample(size, exclude=tried)
+
+            if not entry_ids:
+                raise exceptions.EntryNotFound(f"No entry found in {len(tried)} requests")
+
+            tried.update(entry_ids)
+            results = utils.bounded_map(fetch_entry, entry_ids, workers=workers, ordered=False)
+
+            try:
+                for entry in results:
+                    if entry is None:
+                        continue
+
+                    found += 1
+                    count += 1
+                    yield entry
 
+                    if count == n:
+                        break
+            finally:
+                results.close()
+    finally:
+        if known.path is not None:
+            known.save()
 
-def get_channel(path: str, max_topic: Optional[int] = None) -> Iterator[models.ChannelTopic]:
+
+def get_channel(path: str, max_topic: Optional[int] = None, page: int = 1) -> Iterator[models.ChannelTopic]:
     """This function get channel topics.
 
     Arguments:
     path (str): Channel path.
     max_topic (int|None): Maximum number of topics get from agenda.
+    page (int=1): Specific channel page.
 
     Returns:
     Iterator[models.ChannelTopic (class): ChannelTopic data classes.
     """
 
-    if not path in [channel.path for channel in constants.CHANNELS]:
-        raise exceptions.ChannelNotFound()
+    utils.check_channel(path)
+
+    r = request(constants.CHANNEL_ROUTE.format(path), params={"p": page})
+
+    yield from utils.parse(r, utils.channel_page_parser, max_topic)
+
+
+def get_channel_pages(
+    path: str,
+    max_topic: Optional[int] = None,
+    pages: Optional[int] = None,
+    workers: int = 2,
+) -> Iterator[models.ChannelTopic]:
+    """This function get channel topics across pages, see paginate.
+
+    Arguments:
+    path (str): Channel path.
+    max_topic (int|None): Maximum number of topics get from channel.
+    pages (int|None): Maximum number of pages to get, until the last page if None.
+    workers (int=2): Number of pages fetched in the background.
+
+    Returns:
+    Iterator[models.ChannelTopic] (class): ChannelTopic data classes.
+    """
+
+    utils.check_channel(path)
+
+    yield from paginate(
+        lambda page: request(constants.CHANNEL_ROUTE.format(path), params={"p": page}),
+        utils.channel_page_parser,
+        max_topic,
+        pages,
+        workers,
+    )
 
-    r = request(constants.CHANNEL_ROUTE.format(path))
+
+def paginate(
+    fetch_page: Callable[[int], requests.Response],
+    parser: Callable,
+    max_topic: Optional[int] = None,
+    pages: Optional[int] = None,
+    workers: int = 2,
+) -> Iterator:
+    """Yield the topics of a paginated topic list, fetching the next pages in the background.
+
+    Pages are fetched workers at a time ahead of the one consumed, and stop after a page
+    without a next page link, an empty page or one with only topics already yielded. Topics
+    moving to a later page while the list changes are yielded once.
+    """
+
+    if max_topic is not None and max_topic < 1:
+        return
+
+    pages = itertools.count(1) if pages is None else range(1, pages + 1)
+    seen = set()
+    count = 0
+
+    def fetch(page: int) -> tuple[requests.Response, Optional[list]]:
+        r = fetch_page(page)
+
+        # A page after the last one is not found
+        if page > 1 and r.status_code == HTTPStatus.NOT_FOUND:
+            return r, None
+
+        return r, list(utils.parse(r, parser))
+
+    results = utils.bounded_map(fetch, pages, workers=workers)
 
     try:
-        topic_list = r.html.find("ul.topic-list", first=True).find("a")
-
-        for topic in topic_list[:max_topic]:
-            yield models.ChannelTopic(
-                topic.element.xpath("text()")[0].strip(),
-                urlparse(topic.attrs["href"]).path.split("/")[-1],
-                urlparse(topic.attrs["href"]).query.split("=")[-1],
-                topic.find("small", first=True).text if topic.find("small", first=True) else None,
-            )
-    except AttributeError as e:
-        raise exceptions.ElementNotFound(message=f"Failed to parse channel page: {e}", html=r.html.html)
+        for r, topics in results:
+            new_topics = [topic for topic in topics or () if topic.path not in seen]
+
+            for topic in new_topics:
+                seen.add(topic.path)
+                count += 1
+                yield topic
+
+                if count == max_topic:
+                    return
+
+            if not new_topics or not utils.has_next_page(r):
+                return
+    finally:
+        results.close()
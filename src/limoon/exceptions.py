@@ -29,6 +29,14 @@ class ChannelNotFound(Exception):
     """The channel name is not available."""
 
 
+class RateLimited(Exception):
+    """Raised when requests are still rate limited or challenged after retries."""
+
+
+class NotArchived(Exception):
+    """Raised when a page requested in archive replay mode was never recorded."""
+
+
 class HTMLParsingError(Exception):
     """Raised when an error occurs while parsing HTML."""
 
@@ -40,3 +48,6 @@ class ElementNotFound(HTMLParsingError):
         self.message = message
         self.html = html
         super().__init__(self.message)
+
+    def __reduce__(self):
+        return self.__class__, (self.message, self.html)
@@ -0,0 +1,250 @@
+import csv
+import dataclasses
+import itertools
+import json
+from contextlib import contextmanager
+from datetime import datetime
+from typing import IO, Any, Iterable, Iterator, Optional, Union, get_args, get_origin
+
+from . import models
+
+
+# Output is a file path or an open file object
+Output = Union[str, IO]
+
+
+def field_names(item: Any) -> list[str]:
+    """Exported field names of a model, models.CompactEntry has the fields of models.Entry."""
+
+    if isinstance(item, models.CompactEntry):
+        item = models.Entry
+
+    return [field.name for field in dataclasses.fields(item)]
+
+
+def batches(items: Iterable, batch_size: int) -> Iterator[list]:
+    iterator = iter(items)
+
+    while True:
+        batch = list(itertools.islice(iterator, batch_size))
+
+        if not batch:
+            return
+
+        yield batch
+
+
+def peek(items: Iterable) -> tuple[Optional[Any], Iterator]:
+    """Return the first item and an iterator still yielding it."""
+
+    iterator = iter(items)
+
+    for first in iterator:
+        return first, itertools.chain((first,), iterator)
+
+    return None, iterator
+
+
+def json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if dataclasses.is_dataclass(value):
+        return dataclasses.asdict(value)
+
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, (list, dict)) or dataclasses.is_dataclass(value):
+        return json.dumps(value, default=json_default, ensure_ascii=False)
+
+    return value
+
+
+def write_jsonl(items: Iterable, output: Output, batch_size: int = 1000) -> int:
+    """This function write models as JSON Lines, batch_size models at a time.
+
+    Arguments:
+    items (Iterable): Models, e.g. get_topic().entrys or get_agenda().
+    output (str|IO): File path or text file.
+    batch_size (int=1000): Models kept in memory at once.
+
+    Returns:
+    int: Written model count.
+    """
+
+    first, items = peek(items)
+
+    if first is None:
+        return 0
+
+    names = field_names(first)
+    count = 0
+
+    with _open(output, "w") as file:
+        for batch in batches(items, batch_size):
+            file.write(
+                "".join(
+                    json.dumps(
+                        {name: getattr(item, name) for name in names},
+                        default=json_default,
+                        ensure_ascii=False,
+                    )
+                    + "\n"
+                    for item in batch
+                )
+            )
+            count += len(batch)
+
+    return count
+
+
+def write_csv(items: Iterable, output: Output, batch_size: int = 1000) -> int:
+    """This function write models as CSV with a header row, batch_size models at a time.
+
+    Lists and nested models are written as JSON, datetimes in ISO format and None empty.
+
+    Arguments:
+    items (Iterable): Models, e.g. get_topic().entrys or get_agenda().
+    output (str|IO): File path or text file.
+    batch_size (int=1000): Models kept in memory at once.
+
+    Returns:
+    int: Written model count.
+    """
+
+    first, items = peek(items)
+
+    if first is None:
+        return 0
+
+    names = field_names(first)
+    count = 0
+
+    with _open(output, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(names)
+
+        for batch in batches(items, batch_size):
+            writer.writerows([csv_value(getattr(item, name)) for name in names] for item in batch)
+            count += len(batch)
+
+    return count
+
+
+def write_arrow(items: Iterable, output: Output, batch_size: int = 10_000, format: str = "parquet") -> int:
+    """This function write models as Arrow record batches, columns are read straight from the models.
+
+    Requires pyarrow, install with "pip install limoon[arrow]".
+
+    Arguments:
+    items (Iterable): Models, e.g. get_topic().entrys or get_agenda().
+    output (str|IO): File path or binary file.
+    batch_size (int=10000): Models kept in memory at once, also the row group size.
+    format (str="parquet"): "parquet" file or "arrow" IPC stream.
+
+    Returns:
+    int: Written model count.
+    """
+
+    try:
+        import pyarrow as pa
+    except ImportError as e:
+        raise ImportError('Arrow export requires pyarrow, install with "pip install limoon[arrow]"') from e
+
+    if format not in ("parquet", "arrow"):
+        raise ValueError(f"Unknown format {format!r}, expected 'parquet' or 'arrow'")
+
+    first, items = peek(items)
+
+    if first is None:
+        return 0
+
+    model = models.Entry if isinstance(first, models.CompactEntry) else type(first)
+    types = {field.name: arrow_type(field.type) for field in dataclasses.fields(model)}
+    schema = writer = None
+    count = 0
+
+    try:
+        for batch in batches(items, batch_size):
+            columns = {}
+
+            for name, column_type in types.items():
+                values = [getattr(item, name) for item in batch]
+
+                if column_type is not None and pa.types.is_timestamp(column_type):
+                    # Entry.edited is False when the entry is not edited
+                    values = [value if isinstance(value, datetime) else None for value in values]
+                elif values and dataclasses.is_dataclass(values[0]):
+                    values = [None if value is None else dataclasses.asdict(value) for value in values]
+
+                columns[name] = pa.array(values, type=column_type)
+
+            if schema is None:
+                schema = pa.schema([(name, array.type) for name, array in columns.items()])
+                writer = _arrow_writer(output, schema, format)
+
+            writer.write_batch(pa.RecordBatch.from_pydict(columns, schema=schema))
+            count += len(batch)
+    finally:
+        if writer is not None:
+            writer.close()
+
+    return count
+
+
+def arrow_type(annotation: Any):
+    """Arrow type of a model field annotation, None to infer it from the values."""
+
+    import pyarrow as pa
+
+    if annotation in (str, models.URL):
+        return pa.string()
+    if annotation is bool:
+        return pa.bool_()
+    if annotation is int:
+        return pa.int64()
+    if annotation is datetime:
+        return pa.timestamp("us")
+
+    origin, args = get_origin(annotation), get_args(annotation)
+
+    if origin is Union:
+        if datetime in args:
+            return pa.timestamp("us")
+
+        types = [arrow_type(arg) for arg in args if arg is not type(None)]
+        return types[0] if len(types) == 1 else None
+
+    if origin is list:
+        item_type = arrow_type(args[0]) if args else None
+        return None if item_type is None else pa.list_(item_type)
+
+    return None
+
+
+def _arrow_writer(output: Output, schema, format: str):
+    if format == "parquet":
+        import pyarrow.parquet as pq
+
+        return pq.ParquetWriter(output, schema)
+
+    import pyarrow as pa
+
+    return pa.ipc.new_stream(output, schema)
+
+
+@contextmanager
+def _open(output: Output, mode: str, **kwargs) -> Iterator[IO]:
+    """Open output if it is a path, an open file is left to the caller."""
+
+    if not isinstance(output, str):
+        yield output
+        return
+
+    with open(output, mode, encoding="utf-8", **kwargs) as file:
+        yield file
@@ -0,0 +1,149 @@
+import json
+import os
+from dataclasses import asdict, dataclass
+from typing import Iterable, Iterator, Optional
+
+from . import core, exceptions, models, utils
+from .core import TopicKeywords
+
+
+@dataclass
+class TopicCheckpoint:
+    """TopicCheckpoint data class.
+
+    Arguments:
+    path (str): Unique topic path.
+    entry_id (int): Newest seen entry identity.
+    page_count (int): Topic page count at the last poll.
+    """
+
+    path: str
+    entry_id: int
+    page_count: int
+
+
+class TopicFollower:
+    """Follow topics, yielding only the entrys added since the last poll.
+
+    While no page is added a poll costs a single request per topic, only the last known
+    page and the pages after it are fetched.
+
+    Arguments:
+    topics (Iterable[str]): Keywords (or paths) of topics to follow.
+    path (str|None): JSON file checkpoints are loaded from, and saved to after each poll.
+    from_start (bool=False): Yield the entrys of the last page at the first poll of a topic.
+    workers (int=4): Number of topics polled at the same time.
+    compact (bool=False): Parse entrys as slotted models.CompactEntry.
+    keep_html (bool=True): Keep entry html, None if False.
+    """
+
+    def __init__(
+        self,
+        topics: Iterable[TopicKeywords] = (),
+        path: Optional[str] = None,
+        from_start: bool = False,
+        workers: int = 4,
+        compact: bool = False,
+        keep_html: bool = True,
+    ):
+        self.topics = list(dict.fromkeys(topics))
+        self.path = path
+        self.from_start = from_start
+        self.workers = workers
+        self.compact = compact
+        self.keep_html = keep_html
+        self.checkpoints: dict[str, TopicCheckpoint] = {}
+
+        if path is not None and os.path.exists(path):
+            self.load(path)
+
+    def __repr__(self):
+        return f"TopicFollower({len(self.topics)})"
+
+    def follow(self, topic_keywords: TopicKeywords) -> None:
+        if topic_keywords not in self.topics:
+            self.topics.append(topic_keywords)
+
+    def unfollow(self, topic_keywords: TopicKeywords) -> None:
+        if topic_keywords in self.topics:
+            self.topics.remove(topic_keywords)
+
+        self.checkpoints.pop(topic_keywords, None)
+
+    def poll(self) -> Iterator[models.Entry]:
+        """Yield new entrys of every followed topic, topics in the order they are fetched.
+
+        A topic checkpoint moves only after all its new entrys are yielded, checkpoints are
+        saved to path once the poll is exhausted.
+        """
+
+        polls = utils.bounded_map(self.poll_topic, list(self.topics), workers=self.workers, ordered=False)
+
+        for topic_keywords, checkpoint, entrys in polls:
+            yield from entrys
+            self.checkpoints[topic_keywords] = checkpoint
+
+        if self.path is not None:
+            self.save(self.path)
+
+    def poll_topic(self, topic_keywords: TopicKeywords) -> tuple[str, TopicCheckpoint, list[models.Entry]]:
+        """Fetch new entrys of a topic, return them with the checkpoint after them."""
+
+        checkpoint = self.checkpoints.get(topic_keywords)
+
+        if checkpoint is None:
+            topic = self.get_topic(topic_keywords)
+            page_count = max(topic.page_count, 1)
+
+            if page_count > 1:
+                topic = self.get_topic(topic.path, page_count)
+
+            entrys = list(topic.entrys)
+            entry_id = max((entry.id for entry in entrys), default=0)
+
+            return topic_keywords, TopicCheckpoint(topic.path, entry_id, page_count), entrys if self.from_start else []
+
+        try:
+            topic = self.get_topic(checkpoint.path, checkpoint.page_count)
+        except exceptions.TopicNotFound:
+            # Deleted entrys removed the last known page
+            topic = self.get_topic(checkpoint.path)
+
+        page_count = max(topic.page_count, 1)
+
+        if page_count < checkpoint.page_count:
+            topic = self.get_topic(checkpoint.path, page_count)
+
+        entrys = [entry for entry in topic.entrys if entry.id > checkpoint.entry_id]
+
+        for page in range(checkpoint.page_count + 1, page_count + 1):
+            entrys.extend(
+                entry for entry in self.get_topic(checkpoint.path, page).entrys if entry.id > checkpoint.entry_id
+            )
+
+        entry_id = max((entry.id for entry in entrys), default=checkpoint.entry_id)
+
+        return topic_keywords, TopicCheckpoint(checkpoint.path, entry_id, page_count), entrys
+
+    def get_topic(self, topic_keywords: TopicKeywords, page: int = 1) -> models.Topic:
+        return core.get_topic(topic_keywords, page=page, compact=self.compact, keep_html=self.keep_html)
+
+    def save(self, path: str) -> None:
+        """Write checkpoints to a JSON file, replacing it at once."""
+
+        temporary_path = f"{path}.tmp"
+
+        with open(temporary_path, "w", encoding="utf-8") as file:
+            json.dump({key: asdict(checkpoint) for key, checkpoint in self.checkpoints.items()}, file)
+
+        os.replace(temporary_path, path)
+
+    def load(self, path: str) -> None:
+        """Read checkpoints from a JSON file, following their topics."""
+
+        with open(path, encoding="utf-8") as file:
+            checkpoints = json.load(file)
+
+        for topic_keywords, checkpoint in checkpoints.items():
+            self.checkpoints[topic_keywords] = TopicCheckpoint(**checkpoint)
+            self.follow(topic_keywords)
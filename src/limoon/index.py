@@ -0,0 +1,172 @@
+import base64
+import json
+import os
+import random
+import threading
+import zlib
+from typing import Iterable, Iterator, Optional
+
+from . import constants
+
+
+# Set bit count of every byte value
+POPCOUNT = bytes(bin(value).count("1") for value in range(256))
+
+
+class Bitmap:
+    """Growable bitmap of integers from start, stored zlib compressed.
+
+    Arguments:
+    start (int=0): Smallest integer in the bitmap.
+    data (bytes|None): Bits from to_bytes.
+    """
+
+    def __init__(self, start: int = 0, data: Optional[bytes] = None):
+        self.start = start
+        self._bits = bytearray(zlib.decompress(data)) if data else bytearray()
+
+    def __repr__(self):
+        return f"Bitmap({self.count()})"
+
+    def __contains__(self, value: int) -> bool:
+        index = value - self.start
+
+        return 0 <= index < len(self._bits) * 8 and bool(self._bits[index >> 3] & (1 << (index & 7)))
+
+    def __iter__(self) -> Iterator[int]:
+        for byte_index, byte in enumerate(self._bits):
+            if byte:
+                for bit in range(8):
+                    if byte & (1 << bit):
+                        yield self.start + (byte_index << 3) + bit
+
+    def add(self, value: int) -> None:
+        index = value - self.start
+
+        if index < 0:
+            raise ValueError(f"{value} is below the bitmap start {self.start}")
+
+        if index >> 3 >= len(self._bits):
+            self._bits.extend(bytes((index >> 3) - len(self._bits) + 1))
+
+        self._bits[index >> 3] |= 1 << (index & 7)
+
+    def discard(self, value: int) -> None:
+        if value in self:
+            index = value - self.start
+            self._bits[index >> 3] &= ~(1 << (index & 7)) & 0xFF
+
+    def count(self) -> int:
+        return sum(self._bits.translate(POPCOUNT))
+
+    def to_bytes(self) -> bytes:
+        return zlib.compress(bytes(self._bits))
+
+    def to_text(self) -> str:
+        """Compressed bits as base64 text, for JSON files."""
+
+        return base64.b64encode(self.to_bytes()).decode("ascii")
+
+    @classmethod
+    def from_text(cls, start: int, text: str) -> "Bitmap":
+        return cls(start, base64.b64decode(text))
+
+
+class EntryIndex:
+    """Known valid and missing entry identities, to sample entrys without requesting holes.
+
+    Missing identities are skipped when sampling. The highest valid identity seen replaces
+    constants.TOTAL_ENTRY_COUNT as the sampling range, with headroom above it so newer
+    entrys are found; identities above it that are not found are not recorded as missing.
+
+    Arguments:
+    path (str|None): File the index is loaded from and saved to.
+    headroom (float=0.01): Fraction of the highest valid identity sampled above it.
+    """
+
+    def __init__(self, path: Optional[str] = None, headroom: float = 0.01):
+        self.path = path
+        self.headroom = headroom
+        self.max_id: Optional[int] = None
+        self.found = Bitmap(1)
+        self.missing = Bitmap(1)
+        self._lock = threading.Lock()
+
+        if path is not None and os.path.exists(path):
+            self.load(path)
+
+    def __repr__(self):
+        return f"EntryIndex({self.max_id})"
+
+    @property
+    def upper(self) -> int:
+        """Highest identity sampled."""
+
+        if self.max_id is None:
+            return constants.TOTAL_ENTRY_COUNT
+
+        return self.max_id + int(self.max_id * self.headroom)
+
+    def observe(self, entry_id: int, found: bool = True) -> None:
+        with self._lock:
+            if found:
+                self.found.add(entry_id)
+                self.missing.discard(entry_id)
+
+                if self.max_id is None or entry_id > self.max_id:
+                    self.max_id = entry_id
+            elif self.max_id is not None and entry_id <= self.max_id:
+                self.found.discard(entry_id)
+                self.missing.add(entry_id)
+
+    def observe_entrys(self, entry_ids: Iterable[int]) -> None:
+        """Record valid identities, e.g. of a topic or models.Debe list."""
+
+        for entry_id in entry_ids:
+            self.observe(entry_id)
+
+    def sample(self, k: int, exclude: Iterable[int] = (), rng: random.Random = random) -> list[int]:
+        """Draw up to k distinct identities from 1..upper, skipping known missing ones."""
+
+        upper = self.upper
+        exclude = set(exclude)
+        sample = []
+
+        # Rejection sampling, tries are bounded in case nearly every identity is missing
+        for _ in range(k * 100):
+            if len(sample) == k:
+                break
+
+            entry_id = rng.randint(1, upper)
+
+            if entry_id not in self.missing and entry_id not in exclude:
+                exclude.add(entry_id)
+                sample.append(entry_id)
+
+        return sample
+
+    def save(self, path: Optional[str] = None) -> None:
+        """Write the index to a file, replacing it at once."""
+
+        path = self.path if path is None else path
+        temporary_path = f"{path}.tmp"
+
+        with self._lock:
+            found, missing = self.found.to_bytes(), self.missing.to_bytes()
+            header = {"max_id": self.max_id, "found": len(found), "missing": len(missing)}
+
+        with open(temporary_path, "wb") as file:
+            file.write(json.dumps(header).encode() + b"\n" + found + missing)
+
+        os.replace(temporary_path, path)
+
+    def load(self, path: str) -> None:
+        with open(path, "rb") as file:
+            header = json.loads(file.readline())
+            found = file.read(header["found"])
+            missing = file.read(header["missing"])
+
+        with self._lock:
+            self.max_id = header["max_id"]
+            self.found = Bitmap(1, found)
+            self.missing = Bitmap(1, missing)
@@ -0,0 +1,252 @@
+import bisect
+import threading
+from dataclasses import dataclass, field
+from typing import Optional
+
+
+# Hooks called by core.request, the parsers and the model constructors, None costs a single check
+hooks: Optional["Hooks"] = None
+
+# Histogram bucket upper bounds in seconds
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+# curl timings reported in RequestEvent.timings, microseconds from the start of the transfer
+CURL_TIMINGS = ("namelookup_time", "connect_time", "appconnect_time", "pretransfer_time", "starttransfer_time")
+
+
+@dataclass
+class RequestEvent:
+    """RequestEvent data class.
+
+    Arguments:
+    url (str): Requested URL without params.
+    status_code (int|None): Response status code, None if the request failed.
+    bytes (int): Response body size.
+    seconds (float): Time from sending the request to reading the body.
+    attempt (int): Retry attempt, 0 for the first.
+    timings (dict): Seconds to DNS resolution, connect, TLS, pretransfer and first byte when known.
+    error (str|None): Exception class name if the request failed.
+    """
+
+    url: str
+    status_code: Optional[int]
+    bytes: int
+    seconds: float
+    attempt: int = 0
+    timings: dict = field(default_factory=dict)
+    error: Optional[str] = None
+
+
+class Hooks:
+    """Instrumentation hooks, every method is a no-op. Subclass and override the events needed.
+
+    Set instrument.hooks to an instance to receive events, from every thread at once.
+    """
+
+    def request_start(self, url: str) -> None:
+        """A request is about to be sent."""
+
+    def request_end(self, event: RequestEvent) -> None:
+        """A request finished or failed."""
+
+    def stage(self, name: str, seconds: float) -> None:
+        """Time spent in a parse stage: "html" builds the lxml tree, "model" constructs an entry."""
+
+    def parse_end(self, parser: str, seconds: float) -> None:
+        """A page parser returned, lazily parsed entrys are reported by entrys_parsed."""
+
+    def entrys_parsed(self, engine: str, count: int, seconds: float) -> None:
+        """An entry parser was exhausted after count entrys."""
+
+
+def timings(curl_info: Optional[dict]) -> dict:
+    """Seconds of the curl timings in a curl_adapter response curl_info."""
+
+    if not curl_info:
+        return {}
+
+    return {name[:-5]: curl_info[name] / 1e6 for name in CURL_TIMINGS if curl_info.get(name) is not None}
+
+
+class Histogram:
+    """Thread-safe cumulative histogram.
+
+    Arguments:
+    buckets (tuple=BUCKETS): Bucket upper bounds.
+    """
+
+    def __init__(self, buckets: tuple = BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"Histogram({self.count})"
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            self.counts[bisect.bisect_left(self.buckets, value)] += 1
+            self.count += 1
+            self.sum += value
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+
+class Metrics(Hooks):
+    """Hooks keeping counters and histograms in process, read them or export with snapshot().
+
+    Arguments:
+    buckets (tuple=BUCKETS): Histogram bucket upper bounds in seconds.
+    """
+
+    def __init__(self, buckets: tuple = BUCKETS):
+        self.buckets = buckets
+        self.counters: dict[str, int] = {}
+        self.histograms: dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"Metrics({len(self.counters)}, {len(self.histograms)})"
+
+    def increment(self, name: str, value: int = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def observe(self, name: str, seconds: float) -> None:
+        histogram = self.histograms.get(name)
+
+        if histogram is None:
+            with self._lock:
+                histogram = self.histograms.setdefault(name, Histogram(self.buckets))
+
+        histogram.observe(seconds)
+
+    def request_end(self, event: RequestEvent) -> None:
+        self.increment("requests")
+        self.increment(f"status_{event.status_code}" if event.error is None else f"error_{event.error}")
+        self.increment("bytes", event.bytes)
+        self.observe("request", event.seconds)
+
+        for name, seconds in event.timings.items():
+            self.observe(name, seconds)
+
+    def stage(self, name: str, seconds: float) -> None:
+        self.observe(name, seconds)
+
+    def parse_end(self, parser: str, seconds: float) -> None:
+        self.observe(parser, seconds)
+
+    def entrys_parsed(self, engine: str, count: int, seconds: float) -> None:
+        self.increment("entrys", count)
+        self.observe(f"entry_parser_{engine}", seconds)
+
+    def snapshot(self) -> dict:
+        """Counters and histogram count, sum and mean per name."""
+
+        with self._lock:
+            counters = dict(self.counters)
+            histograms = dict(self.histograms)
+
+        return {
+            "counters": counters,
+            "histograms": {
+                name: {"count": histogram.count, "sum": histogram.sum, "mean": histogram.mean}
+                for name, histogram in histograms.items()
+            },
+        }
+
+
+class PrometheusHooks(Hooks):
+    """Hooks exporting to Prometheus, install with "pip install limoon[prometheus]".
+
+    Arguments:
+    registry (CollectorRegistry|None): prometheus_client registry, the default one if None.
+    namespace (str="limoon"): Metric name prefix.
+    """
+
+    def __init__(self, registry=None, namespace: str = "limoon"):
+        try:
+            from prometheus_client import REGISTRY, Counter, Histogram
+        except ImportError as e:
+            raise ImportError(
+                'Prometheus export requires prometheus-client, install with "pip install limoon[prometheus]"'
+            ) from e
+
+        registry = REGISTRY if registry is None else registry
+        options = dict(namespace=namespace, registry=registry)
+
+        self.requests = Counter("requests", "Requests sent.", ["status"], **options)
+        self.bytes = Counter("response_bytes", "Response body bytes read.", **options)
+        self.request_seconds = Histogram("request_seconds", "Request time.", buckets=BUCKETS, **options)
+        self.timing_seconds = Histogram(
+            "request_timing_seconds", "curl timings.", ["timing"], buckets=BUCKETS, **options
+        )
+        self.stage_seconds = Histogram("stage_seconds", "Parse stage time.", ["stage"], buckets=BUCKETS, **options)
+        self.parse_seconds = Histogram("parse_seconds", "Page parser time.", ["parser"], buckets=BUCKETS, **options)
+        self.entrys = Counter("entrys", "Entrys parsed.", ["engine"], **options)
+
+    def request_end(self, event: RequestEvent) -> None:
+        self.requests.labels(str(event.status_code) if event.error is None else event.error).inc()
+        self.bytes.inc(event.bytes)
+        self.request_seconds.observe(event.seconds)
+
+        for name, seconds in event.timings.items():
+            self.timing_seconds.labels(name).observe(seconds)
+
+    def stage(self, name: str, seconds: float) -> None:
+        self.stage_seconds.labels(name).observe(seconds)
+
+    def parse_end(self, parser: str, seconds: float) -> None:
+        self.parse_seconds.labels(parser).observe(seconds)
+
+    def entrys_parsed(self, engine: str, count: int, seconds: float) -> None:
+        self.entrys.labels(engine).inc(count)
+        self.stage_seconds.labels(f"entry_parser_{engine}").observe(seconds)
+
+
+class OpenTelemetryHooks(Hooks):
+    """Hooks exporting to OpenTelemetry metrics, install with "pip install limoon[opentelemetry]".
+
+    Arguments:
+    meter_provider (MeterProvider|None): OpenTelemetry meter provider, the global one if None.
+    """
+
+    def __init__(self, meter_provider=None):
+        try:
+            from opentelemetry import metrics
+        except ImportError as e:
+            raise ImportError(
+                'OpenTelemetry export requires opentelemetry-api, install with "pip install limoon[opentelemetry]"'
+            ) from e
+
+        meter = metrics.get_meter("limoon", meter_provider=meter_provider)
+
+        self.requests = meter.create_counter("limoon.requests", description="Requests sent.")
+        self.bytes = meter.create_counter("limoon.response.bytes", unit="By", description="Response body bytes read.")
+        self.request_seconds = meter.create_histogram("limoon.request.duration", unit="s")
+        self.timing_seconds = meter.create_histogram("limoon.request.timing", unit="s")
+        self.stage_seconds = meter.create_histogram("limoon.stage.duration", unit="s")
+        self.parse_seconds = meter.create_histogram("limoon.parse.duration", unit="s")
+        self.entrys = meter.create_counter("limoon.entrys", description="Entrys parsed.")
+
+    def request_end(self, event: RequestEvent) -> None:
+        self.requests.add(1, {"status": str(event.status_code) if event.error is None else event.error})
+        self.bytes.add(event.bytes)
+        self.request_seconds.record(event.seconds)
+
+        for name, seconds in event.timings.items():
+            self.timing_seconds.record(seconds, {"timing": name})
+
+    def stage(self, name: str, seconds: float) -> None:
+        self.stage_seconds.record(seconds, {"stage": name})
+
+    def parse_end(self, parser: str, seconds: float) -> None:
+        self.parse_seconds.record(seconds, {"parser": parser})
+
+    def entrys_parsed(self, engine: str, count: int, seconds: float) -> None:
+        self.entrys.add(count, {"engine": engine})
+        self.stage_seconds.record(seconds, {"stage": f"entry_parser_{engine}"})
@@ -2,6 +2,7 @@ import re
 from urllib.parse import urlparse
 from dataclasses import dataclass, field
 from datetime import datetime
+from functools import lru_cache
 from typing import Callable, Iterator, Optional, TypeVar, Union
 
 from . import constants
@@ -11,6 +12,57 @@ from . import constants
 URL = TypeVar("URL", Callable, str)
 
 
+DATE_PATTERN = re.compile(r"([0-9]{2}\.[0-9]{2}\.[0-9]{4})(?: ([0-9]{2}):([0-9]{2}))?")
+TIME_PATTERN = re.compile(r"([0-9]{2}):([0-9]{2})")
+RANK_PATTERN = re.compile(r"(\D+) \((\d+)\)")
+
+
+def parse_rank(text: str) -> "Rank":
+    """Parse "name (karma)" author rank text."""
+
+    result = RANK_PATTERN.match(text)
+    return Rank(result.group(1), int(result.group(2)))
+
+
+@lru_cache(maxsize=8192)
+def parse_day(day: str) -> tuple[int, int, int]:
+    year, month, day = int(day[6:10]), int(day[3:5]), int(day[0:2])
+    datetime(year, month, day)
+    return year, month, day
+
+
+def parse_date(value: str) -> datetime:
+    """Parse "dd.mm.yyyy[ hh:mm]", other shapes fall back to strptime with the same result."""
+
+    match = DATE_PATTERN.fullmatch(value)
+
+    if match is None:
+        for fmt in ("%d.%m.%Y %H:%M", "%d.%m.%Y"):
+            try:
+                return datetime.strptime(value, fmt)
+            except ValueError:
+                continue
+
+        raise ValueError(value)
+
+    day, hour, minute = match.groups()
+
+    if hour is None:
+        return datetime(*parse_day(day))
+    return datetime(*parse_day(day), int(hour), int(minute))
+
+
+def parse_time(created: datetime, value: str) -> datetime:
+    """Parse "hh:mm" on the day of created."""
+
+    match = TIME_PATTERN.fullmatch(value)
+
+    if match is None:
+        return datetime.strptime(f"{created.strftime('%d.%m.%Y')} {value}", "%d.%m.%Y %H:%M")
+
+    return datetime(created.year, created.month, created.day, int(match.group(1)), int(match.group(2)))
+
+
 @dataclass
 class Entry:
     """Entry data class.
@@ -55,7 +107,7 @@ class Entry:
     def __post_init__(self):
         self.created, self.edited = self._parse_datetime(self.date)
         self.url = constants.BASE_URL + constants.ENTRY_ROUTE.format(self.id)
-        self.images_source = self._conver_image_url() if self.images else None
+        self.images_source = self._conver_image_url() if self.images and self.created else None
 
     def _conver_image_url(self) -> list[URL]:
         images_source = []
@@ -73,37 +125,114 @@ class Entry:
 
         return images_source
 
-    def _parse_datetime(self, stuff: str) -> tuple[datetime, Union[datetime, bool]]:
-        def parse_single(value: str) -> datetime:
-            value = value.strip()
-
-            for fmt in ("%d.%m.%Y %H:%M", "%d.%m.%Y"):
-                try:
-                    return datetime.strptime(value, fmt)
-                except ValueError:
-                    continue
-
-            raise ValueError(value)
+    @staticmethod
+    def _parse_datetime(stuff: Optional[str]) -> tuple[Optional[datetime], Union[datetime, bool, None]]:
+        # Entrys parsed without the date field
+        if stuff is None:
+            return None, None
 
         if "~" not in stuff:
-            return parse_single(stuff), False
+            return parse_date(stuff.strip()), False
 
         created_str, edited_str = map(str.strip, stuff.split("~"))
-        created = parse_single(created_str)
+        created = parse_date(created_str)
 
         if not edited_str:
             edited = False
         elif "." in edited_str:
-            try:
-                edited = datetime.strptime(edited_str, "%d.%m.%Y %H:%M")
-            except ValueError:
-                edited = datetime.strptime(edited_str, "%d.%m.%Y")
+            edited = parse_date(edited_str)
         else:
-            edited = datetime.strptime(f"{created.strftime('%d.%m.%Y')} {edited_str}", "%d.%m.%Y %H:%M")
+            edited = parse_time(created, edited_str)
 
         return created, edited
 
 
+class CompactEntry:
+    """Slotted entry class, created, edited, url and images_source are computed on first access.
+
+    Arguments are the same as Entry, html is None when parsed without keep_html.
+    """
+
+    __slots__ = (
+        "id",
+        "author_nickname",
+        "text",
+        "html",
+        "favorite_count",
+        "date",
+        "topic_title",
+        "topic_path",
+        "is_pinned",
+        "is_pinned_on_profile",
+        "images",
+        "_created",
+        "_edited",
+        "_images_source",
+    )
+
+    def __init__(
+        self,
+        id: int,
+        author_nickname: str,
+        text: str,
+        html: Optional[str],
+        favorite_count: int,
+        date: str,
+        topic_title: str,
+        topic_path: str,
+        is_pinned: bool,
+        is_pinned_on_profile: bool,
+        images: Optional[list[URL]],
+    ):
+        self.id = id
+        self.author_nickname = author_nickname
+        self.text = text
+        self.html = html
+        self.favorite_count = favorite_count
+        self.date = date
+        self.topic_title = topic_title
+        self.topic_path = topic_path
+        self.is_pinned = is_pinned
+        self.is_pinned_on_profile = is_pinned_on_profile
+        self.images = images
+
+    def __repr__(self):
+        return f"CompactEntry({self.id})"
+
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__[:11])
+
+    @property
+    def created(self) -> datetime:
+        try:
+            return self._created
+        except AttributeError:
+            self._created, self._edited = Entry._parse_datetime(self.date)
+            return self._created
+
+    @property
+    def edited(self) -> Union[datetime, bool]:
+        try:
+            return self._edited
+        except AttributeError:
+            self._created, self._edited = Entry._parse_datetime(self.date)
+            return self._edited
+
+    @property
+    def url(self) -> URL:
+        return constants.BASE_URL + constants.ENTRY_ROUTE.format(self.id)
+
+    @property
+    def images_source(self) -> Optional[list[URL]]:
+        try:
+            return self._images_source
+        except AttributeError:
+            self._images_source = Entry._conver_image_url(self) if self.images and self.created else None
+            return self._images_source
+
+
 @dataclass
 class Topic:
     """Topic data class.
@@ -205,8 +334,29 @@ class Author:
     def _parse_rank(self, stuff: Union[Rank, None]) -> Union[Rank, None]:
         if isinstance(stuff, type(None)):
             return None
-        result = re.match(r"(\D+) \((\d+)\)", stuff.text)
-        return Rank(result.group(1), int(result.group(2)))
+        return parse_rank(stuff.text)
+
+
+@dataclass
+class AuthorProfile:
+    """AuthorProfile data class, sections not included are None.
+
+    Arguments:
+    nickname (str): Unique author nickname.
+    author (Author|None): Author data class.
+    rank (Rank|None): Author rank.
+    badges (list[Badge]|None): Author badges.
+    topic (Topic|None): Author own topic, None if not found.
+    """
+
+    nickname: str
+    author: Optional[Author] = None
+    rank: Optional[Rank] = None
+    badges: Optional[list[Badge]] = None
+    topic: Optional[Topic] = None
+
+    def __repr__(self):
+        return f"AuthorProfile({self.nickname})"
 
 
 @dataclass
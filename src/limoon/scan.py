@@ -0,0 +1,260 @@
+import json
+import os
+import socket
+import time
+from dataclasses import dataclass
+from typing import Iterable, Iterator, Optional, Union
+
+from . import constants, core, exceptions, models, utils
+from .index import Bitmap
+
+
+@dataclass
+class Shard:
+    """Shard data class.
+
+    Arguments:
+    start (int): First entry identity.
+    end (int): Entry identity after the last one.
+    """
+
+    start: int
+    end: int
+
+    def __repr__(self):
+        return f"Shard({self.start}, {self.end})"
+
+    @property
+    def name(self) -> str:
+        return f"{self.start:010d}-{self.end:010d}"
+
+
+@dataclass
+class ShardCheckpoint:
+    """ShardCheckpoint data class.
+
+    Arguments:
+    shard (Shard): Scanned shard.
+    next_id (int): Next entry identity to fetch.
+    found (Bitmap): Entry identities fetched.
+    missing (Bitmap): Entry identities not found (deleted or never used).
+    """
+
+    shard: Shard
+    next_id: int
+    found: Bitmap
+    missing: Bitmap
+
+    def __repr__(self):
+        return f"ShardCheckpoint({self.shard.name}, {self.next_id})"
+
+    @property
+    def done(self) -> bool:
+        return self.next_id >= self.shard.end
+
+
+class EntryScanner:
+    """Scan an entry identity range in shards, yielding every entry found.
+
+    Shards are claimed with claim files next to their checkpoints, so threads, processes or
+    machines sharing path scan different shards. Checkpoints record the next identity and
+    found and missing identities as bitmaps, a stopped scan resumes from the last entry
+    yielded, which is yielded again. A claim not refreshed for claim_ttl seconds is
+    considered abandoned.
+
+    Arguments:
+    path (str): Directory of checkpoint and claim files, created if missing.
+    start (int=1): First entry identity.
+    end (int|None): Entry identity after the last one, constants.TOTAL_ENTRY_COUNT + 1 if None.
+    shard_size (int=1000000): Entry identities per shard.
+    workers (int=4): Number of entrys fetched at the same time.
+    checkpoint_every (int=1000): Entry identities yielded or skipped between checkpoint saves.
+    claim_ttl (float=600): Seconds before an unrefreshed claim can be taken over.
+    compact (bool=False): Parse entrys as slotted models.CompactEntry.
+    keep_html (bool=True): Keep entry html, None if False.
+    fields (Iterable[str]|None): Entry fields to parse, others are None, all fields if None.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        start: int = 1,
+        end: Optional[int] = None,
+        shard_size: int = 1_000_000,
+        workers: int = 4,
+        checkpoint_every: int = 1000,
+        claim_ttl: float = 600,
+        compact: bool = False,
+        keep_html: bool = True,
+        fields: Optional[Iterable[str]] = None,
+    ):
+        os.makedirs(path, exist_ok=True)
+
+        self.path = path
+        self.start = start
+        self.end = constants.TOTAL_ENTRY_COUNT + 1 if end is None else end
+        self.shard_size = shard_size
+        self.workers = workers
+        self.checkpoint_every = checkpoint_every
+        self.claim_ttl = claim_ttl
+        self.compact = compact
+        self.keep_html = keep_html
+        self.fields = utils.entry_fields(fields)
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{id(self)}"
+
+    def __repr__(self):
+        return f"EntryScanner({self.start}, {self.end})"
+
+    def shards(self) -> list[Shard]:
+        return [
+            Shard(start, min(start + self.shard_size, self.end))
+            for start in range(self.start, self.end, self.shard_size)
+        ]
+
+    def scan(self) -> Iterator[models.Entry]:
+        """Claim unfinished shards one by one and yield their entrys, until none is left to claim."""
+
+        while True:
+            shard = self.claim()
+
+            if shard is None:
+                return
+
+            try:
+                yield from self.scan_shard(shard)
+            finally:
+                self.release(shard)
+
+    def scan_shard(self, shard: Shard) -> Iterator[models.Entry]:
+        """Yield the entrys of a shard from its checkpoint, saving it as the scan moves on."""
+
+        checkpoint = self.load(shard)
+        unsaved = 0
+
+        def fetch(entry_id: int) -> tuple[int, Union[models.Entry, exceptions.EntryNotFound]]:
+            try:
+                return entry_id, core.get_entry(entry_id, self.compact, self.keep_html, self.fields)
+            except exceptions.EntryNotFound as e:
+                return entry_id, e
+
+        try:
+            for entry_id, result in utils.bounded_map(fetch, range(checkpoint.next_id, shard.end), self.workers):
+                if isinstance(result, exceptions.EntryNotFound):
+                    checkpoint.missing.add(entry_id)
+                else:
+                    checkpoint.found.add(entry_id)
+                    yield result
+
+                checkpoint.next_id = entry_id + 1
+                unsaved += 1
+
+                if unsaved >= self.checkpoint_every:
+                    self.save(checkpoint)
+                    unsaved = 0
+        finally:
+            self.save(checkpoint)
+
+    def claim(self) -> Optional[Shard]:
+        """Claim the first unfinished shard not claimed by another scanner."""
+
+        for shard in self.shards():
+            if self.load(shard).done:
+                continue
+
+            if self._create_claim(self._path(shard, "claim")):
+                return shard
+
+        return None
+
+    def release(self, shard: Shard) -> None:
+        claim_path = self._path(shard, "claim")
+
+        try:
+            with open(claim_path) as file:
+                if file.read() != self.owner:
+                    return
+            os.remove(claim_path)
+        except FileNotFoundError:
+            pass
+
+    def load(self, shard: Shard) -> ShardCheckpoint:
+        try:
+            with open(self._path(shard, "json"), encoding="utf-8") as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            return ShardCheckpoint(shard, shard.start, Bitmap(shard.start), Bitmap(shard.start))
+
+        return ShardCheckpoint(
+            shard,
+            data["next_id"],
+            Bitmap.from_text(shard.start, data["found"]),
+            Bitmap.from_text(shard.start, data["missing"]),
+        )
+
+    def save(self, checkpoint: ShardCheckpoint) -> None:
+        """Write a shard checkpoint at once and refresh its claim."""
+
+        path = self._path(checkpoint.shard, "json")
+        temporary_path = f"{path}.{os.getpid()}.tmp"
+
+        with open(temporary_path, "w", encoding="utf-8") as file:
+            json.dump(
+                {
+                    "start": checkpoint.shard.start,
+                    "end": checkpoint.shard.end,
+                    "next_id": checkpoint.next_id,
+                    "found": checkpoint.found.to_text(),
+                    "missing": checkpoint.missing.to_text(),
+                },
+                file,
+            )
+
+        os.replace(temporary_path, path)
+
+        try:
+            os.utime(self._path(checkpoint.shard, "claim"))
+        except FileNotFoundError:
+            pass
+
+    def checkpoints(self) -> Iterator[ShardCheckpoint]:
+        """Yield the checkpoint of every shard, e.g. to report progress."""
+
+        for shard in self.shards():
+            yield self.load(shard)
+
+    def _create_claim(self, claim_path: str) -> bool:
+        for _ in range(2):
+            try:
+                descriptor = os.open(claim_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                if not self._remove_abandoned(claim_path):
+                    return False
+                continue
+
+            with os.fdopen(descriptor, "w") as file:
+                file.write(self.owner)
+
+            return True
+
+        return False
+
+    def _remove_abandoned(self, claim_path: str) -> bool:
+        """Remove a claim not refreshed for claim_ttl seconds, False if it is still held."""
+
+        abandoned_path = f"{claim_path}.{os.getpid()}-{id(self)}"
+
+        try:
+            if time.time() - os.path.getmtime(claim_path) < self.claim_ttl:
+                return False
+
+            # Renaming is atomic, only one scanner removes an abandoned claim
+            os.rename(claim_path, abandoned_path)
+        except FileNotFoundError:
+            return True
+
+        os.remove(abandoned_path)
+
+        return True
+
+    def _path(self, shard: Shard, extension: str) -> str:
+        return os.path.join(self.path, f"{shard.name}.{extension}")
@@ -0,0 +1,252 @@
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Iterable, Iterator, Optional, Union
+
+from . import models
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entrys (
+    id INTEGER PRIMARY KEY,
+    author_nickname TEXT,
+    text TEXT,
+    html TEXT,
+    favorite_count INTEGER,
+    date TEXT,
+    topic_title TEXT,
+    topic_path TEXT,
+    is_pinned INTEGER,
+    is_pinned_on_profile INTEGER,
+    images TEXT,
+    created TEXT
+);
+CREATE INDEX IF NOT EXISTS entrys_author ON entrys (author_nickname, created);
+CREATE INDEX IF NOT EXISTS entrys_topic ON entrys (topic_path, created);
+CREATE INDEX IF NOT EXISTS entrys_created ON entrys (created);
+CREATE VIRTUAL TABLE IF NOT EXISTS entrys_text USING fts5 (
+    text, content='entrys', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS entrys_insert AFTER INSERT ON entrys BEGIN
+    INSERT INTO entrys_text (rowid, text) VALUES (new.id, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS entrys_delete AFTER DELETE ON entrys BEGIN
+    INSERT INTO entrys_text (entrys_text, rowid, text) VALUES ('delete', old.id, old.text);
+END;
+CREATE TRIGGER IF NOT EXISTS entrys_update AFTER UPDATE OF text ON entrys BEGIN
+    INSERT INTO entrys_text (entrys_text, rowid, text) VALUES ('delete', old.id, old.text);
+    INSERT INTO entrys_text (rowid, text) VALUES (new.id, new.text);
+END;
+"""
+
+COLUMNS = (
+    "id",
+    "author_nickname",
+    "text",
+    "html",
+    "favorite_count",
+    "date",
+    "topic_title",
+    "topic_path",
+    "is_pinned",
+    "is_pinned_on_profile",
+    "images",
+)
+
+
+class EntryStore:
+    """Local SQLite entry store with a full-text index over entry text.
+
+    Entrys are kept by id, storing an entry again replaces it. Lookups by author, topic path
+    and creation date use indexes, text search uses SQLite FTS5.
+
+    Arguments:
+    path (str=":memory:"): SQLite database file path.
+    compact (bool=False): Return entrys as slotted models.CompactEntry.
+    """
+
+    def __init__(self, path: str = ":memory:", compact: bool = False):
+        self.path = path
+        self.compact = compact
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.executescript(SCHEMA)
+
+    def __repr__(self):
+        return f"EntryStore({self.path!r})"
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM entrys").fetchone()[0]
+
+    def __contains__(self, entry_id: int) -> bool:
+        return self.get(entry_id) is not None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def upsert(self, entrys: Iterable[Union[models.Entry, models.CompactEntry]], batch_size: int = 1000) -> int:
+        """Store entrys, replacing the stored ones with the same id.
+
+        Arguments:
+        entrys (Iterable[models.Entry]): Entrys, e.g. get_topic().entrys.
+        batch_size (int=1000): Entrys written per transaction.
+
+        Returns:
+        int: Stored entry count.
+        """
+
+        count = 0
+        batch = []
+
+        for entry in entrys:
+            batch.append(
+                (
+                    entry.id,
+                    entry.author_nickname,
+                    entry.text,
+                    entry.html,
+                    entry.favorite_count,
+                    entry.date,
+                    entry.topic_title,
+                    entry.topic_path,
+                    entry.is_pinned,
+                    entry.is_pinned_on_profile,
+                    None if entry.images is None else json.dumps(entry.images),
+                    None if entry.created is None else entry.created.isoformat(sep=" "),
+                )
+            )
+
+            if len(batch) >= batch_size:
+                count += self._write(batch)
+                batch = []
+
+        if batch:
+            count += self._write(batch)
+
+        return count
+
+    def get(self, entry_id: int) -> Optional[models.Entry]:
+        with self._lock:
+            row = self._connection.execute(
+                f"SELECT {', '.join(COLUMNS)} FROM entrys WHERE id = ?",
+                (entry_id,),
+            ).fetchone()
+
+        return None if row is None else self._entry(row)
+
+    def find(
+        self,
+        author: Optional[str] = None,
+        topic_path: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[models.Entry]:
+        """Yield stored entrys matching every given filter, oldest first.
+
+        Arguments:
+        author (str|None): Author nickname.
+        topic_path (str|None): Unique topic path.
+        start (datetime|None): Created at or after.
+        end (datetime|None): Created before.
+        limit (int|None): Maximum entry count.
+        """
+
+        where, params = self._filters(author, topic_path, start, end)
+
+        yield from self._query(
+            f"SELECT {', '.join(COLUMNS)} FROM entrys {where} ORDER BY created, id LIMIT ?",
+            params + [-1 if limit is None else limit],
+        )
+
+    def search(
+        self,
+        query: str,
+        author: Optional[str] = None,
+        topic_path: Optional[str] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: Optional[int] = 100,
+    ) -> Iterator[models.Entry]:
+        """Yield stored entrys whose text matches an FTS5 query, best match first.
+
+        Arguments:
+        query (str): FTS5 query, e.g. 'linux' or '"gnu linux" OR çekirdek'.
+        author, topic_path, start, end: Same filters as find.
+        limit (int|None=100): Maximum entry count.
+        """
+
+        where, params = self._filters(author, topic_path, start, end, prefix="entrys.")
+        where = f"{where} AND" if where else "WHERE"
+        columns = ", ".join(f"entrys.{column}" for column in COLUMNS)
+
+        yield from self._query(
+            f"SELECT {columns} FROM entrys_text JOIN entrys ON entrys.id = entrys_text.rowid "
+            f"{where} entrys_text MATCH ? ORDER BY entrys_text.rank LIMIT ?",
+            params + [query, -1 if limit is None else limit],
+        )
+
+    def delete(self, entry_id: int) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM entrys WHERE id = ?", (entry_id,))
+            self._connection.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def _write(self, rows: list[tuple]) -> int:
+        with self._lock:
+            self._connection.executemany(
+                f"INSERT INTO entrys ({', '.join(COLUMNS)}, created) VALUES ({', '.join('?' * (len(COLUMNS) + 1))}) "
+                f"ON CONFLICT (id) DO UPDATE SET "
+                + ", ".join(f"{column} = excluded.{column}" for column in COLUMNS[1:] + ("created",)),
+                rows,
+            )
+            self._connection.commit()
+
+        return len(rows)
+
+    def _filters(
+        self,
+        author: Optional[str],
+        topic_path: Optional[str],
+        start: Optional[datetime],
+        end: Optional[datetime],
+        prefix: str = "",
+    ) -> tuple[str, list]:
+        conditions, params = [], []
+
+        if author is not None:
+            conditions.append(f"{prefix}author_nickname = ?")
+            params.append(author)
+        if topic_path is not None:
+            conditions.append(f"{prefix}topic_path = ?")
+            params.append(topic_path)
+        if start is not None:
+            conditions.append(f"{prefix}created >= ?")
+            params.append(start.isoformat(sep=" "))
+        if end is not None:
+            conditions.append(f"{prefix}created < ?")
+            params.append(end.isoformat(sep=" "))
+
+        return ("WHERE " + " AND ".join(conditions) if conditions else ""), params
+
+    def _query(self, sql: str, params: list) -> Iterator[models.Entry]:
+        with self._lock:
+            rows = self._connection.execute(sql, params).fetchall()
+
+        for row in rows:
+            yield self._entry(row)
+
+    def _entry(self, row: tuple) -> models.Entry:
+        row = list(row)
+        row[8], row[9] = bool(row[8]), bool(row[9])
+        row[10] = None if row[10] is None else json.loads(row[10])
+
+        return (models.CompactEntry if self.compact else models.Entry)(*row)
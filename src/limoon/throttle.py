@@ -0,0 +1,145 @@
+import asyncio
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from http import HTTPStatus
+from typing import Optional
+
+
+TRANSIENT_STATUS_CODES = (
+    HTTPStatus.TOO_MANY_REQUESTS,
+    HTTPStatus.INTERNAL_SERVER_ERROR,
+    HTTPStatus.BAD_GATEWAY,
+    HTTPStatus.SERVICE_UNAVAILABLE,
+    HTTPStatus.GATEWAY_TIMEOUT,
+)
+
+
+class TokenBucket:
+    """Thread-safe token bucket.
+
+    Arguments:
+    rate (float): Tokens added per second.
+    capacity (float): Maximum stored tokens, the allowed burst.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token, return seconds to wait before using it."""
+
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+
+class RateLimiter:
+    """Adaptive per-host rate limiter shared by threads and asyncio tasks.
+
+    The rate grows additively on success and halves on rate limiting or transient errors.
+
+    Arguments:
+    rate (float=5): Initial requests per second per host.
+    burst (float=10): Requests allowed at once per host.
+    min_rate (float=0.5): Lowest requests per second after errors.
+    max_rate (float=20): Highest requests per second after successes.
+    increase (float=0.1): Requests per second added on each success.
+    """
+
+    def __init__(
+        self,
+        rate: float = 5,
+        burst: float = 10,
+        min_rate: float = 0.5,
+        max_rate: float = 20,
+        increase: float = 0.1,
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, host: str) -> TokenBucket:
+        with self._lock:
+            if host not in self._buckets:
+                self._buckets[host] = TokenBucket(self.rate, self.burst)
+
+            return self._buckets[host]
+
+    def wait(self, host: str) -> None:
+        delay = self.bucket(host).reserve()
+
+        if delay > 0:
+            time.sleep(delay)
+
+    async def async_wait(self, host: str) -> None:
+        delay = self.bucket(host).reserve()
+
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def success(self, host: str) -> None:
+        bucket = self.bucket(host)
+
+        with bucket._lock:
+            bucket.rate = min(self.max_rate, bucket.rate + self.increase)
+
+    def failure(self, host: str) -> None:
+        bucket = self.bucket(host)
+
+        with bucket._lock:
+            bucket.rate = max(self.min_rate, bucket.rate / 2)
+
+
+def is_challenge(status_code: int, headers, content: bytes) -> bool:
+    """Whether the response is a Cloudflare challenge page."""
+
+    if headers.get("cf-mitigated") == "challenge":
+        return True
+
+    return status_code in (HTTPStatus.FORBIDDEN, HTTPStatus.SERVICE_UNAVAILABLE) and b"challenge-platform" in content
+
+
+def is_transient(status_code: int, headers, content: bytes) -> bool:
+    return status_code in TRANSIENT_STATUS_CODES or is_challenge(status_code, headers, content)
+
+
+def retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header, seconds or HTTP date."""
+
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff(attempt: int, retry_after_value: Optional[str] = None, base: float = 0.5, cap: float = 60) -> float:
+    """Seconds to wait before retry attempt, Retry-After if given, full jitter exponential otherwise."""
+
+    delay = retry_after(retry_after_value)
+
+    if delay is not None:
+        return min(cap, delay)
+
+    return random.uniform(0, min(cap, base * 2**attempt))
@@ -1,10 +1,50 @@
+import contextvars
+import dataclasses
 import re
-from typing import Iterator, Optional
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from http import HTTPStatus
+from typing import Callable, Iterable, Iterator, Optional, TypeVar, Union
 from urllib.parse import urlparse
 
-from requests_html import HTML
+import requests
+from lxml import etree
+from pyquery.text import extract_text
+from requests.structures import CaseInsensitiveDict
+from requests_html import HTML, Element, HTMLResponse, HTMLSession
 
-from . import models
+from . import constants, exceptions, instrument, models
+
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Entry constructor arguments, in order
+ENTRY_FIELDS = (
+    "id",
+    "author_nickname",
+    "text",
+    "html",
+    "favorite_count",
+    "date",
+    "topic_title",
+    "topic_path",
+    "is_pinned",
+    "is_pinned_on_profile",
+    "images",
+)
+
+# Fields computed from the constructor arguments
+DERIVED_ENTRY_FIELDS = {
+    "created": ("date",),
+    "edited": ("date",),
+    "url": (),
+    "images_source": ("images", "date"),
+}
+
+ALL_ENTRY_FIELDS = frozenset(ENTRY_FIELDS)
 
 
 def find_image_url(html: str) -> Optional[list]:
@@ -16,7 +56,106 @@ def find_image_url(html: str) -> Optional[list]:
     return None
 
 
-def entry_parser(html: HTML, max_entry: Optional[int] = None) -> Iterator[models.Entry]:
+def entry_fields(fields: Optional[Iterable[str]]) -> Optional[frozenset]:
+    """Return the entry constructor arguments needed for fields, None for every field.
+
+    id is always included, derived fields add the arguments they are computed from.
+    """
+
+    if fields is None:
+        return None
+
+    names = {"id"}
+
+    for name in fields:
+        if name in DERIVED_ENTRY_FIELDS:
+            names.update(DERIVED_ENTRY_FIELDS[name])
+        elif name in ALL_ENTRY_FIELDS:
+            names.add(name)
+        else:
+            raise ValueError(f"Unknown entry field {name!r}")
+
+    return frozenset(names)
+
+
+def project(args: tuple, fields: Optional[frozenset]) -> tuple:
+    """Replace entry constructor arguments not in fields with None."""
+
+    if fields is None:
+        return args
+
+    return tuple(value if name in fields else None for name, value in zip(ENTRY_FIELDS, args))
+
+
+def construct(entry_class: type, args: tuple) -> models.Entry:
+    """Construct an entry, timing the model constructor when instrument.hooks is set."""
+
+    hooks = instrument.hooks
+
+    if hooks is None:
+        return entry_class(*args)
+
+    start = time.perf_counter()
+    entry = entry_class(*args)
+    hooks.stage("model", time.perf_counter() - start)
+
+    return entry
+
+
+def timed_entrys(entrys: Iterator[models.Entry], engine: str, hooks: instrument.Hooks) -> Iterator[models.Entry]:
+    """Yield entrys, reporting their count and the time spent parsing them once exhausted."""
+
+    count, seconds = 0, 0.0
+
+    while True:
+        start = time.perf_counter()
+        entry = next(entrys, None)
+        seconds += time.perf_counter() - start
+
+        if entry is None:
+            break
+
+        count += 1
+        yield entry
+
+    hooks.entrys_parsed(engine, count, seconds)
+
+
+def entry_parser(
+    html: HTML,
+    max_entry: Optional[int] = None,
+    engine: Optional[str] = None,
+    compact: bool = False,
+    keep_html: bool = True,
+    fields: Optional[frozenset] = None,
+) -> Iterator[models.Entry]:
+    """Parse entrys with engine, constants.PARSER_ENGINE if None ("lxml" or "requests_html").
+
+    compact yields models.CompactEntry, keep_html=False drops the entry html after finding images.
+    fields (from entry_fields) skips parsing the other fields, they are None.
+    """
+
+    engine = engine or constants.PARSER_ENGINE
+
+    if engine == "lxml":
+        entrys = lxml_entry_parser(html, max_entry, compact, keep_html, fields)
+    else:
+        entrys = requests_html_entry_parser(html, max_entry, compact, keep_html, fields)
+
+    hooks = instrument.hooks
+
+    return entrys if hooks is None else timed_entrys(entrys, engine, hooks)
+
+
+def requests_html_entry_parser(
+    html: HTML,
+    max_entry: Optional[int] = None,
+    compact: bool = False,
+    keep_html: bool = True,
+    fields: Optional[frozenset] = None,
+) -> Iterator[models.Entry]:
+    entry_class = models.CompactEntry if compact else models.Entry
+
     try:
         entry_items = html.find("ul#entry-item-list", first=True).find("li#entry-item")
     except AttributeError:
@@ -32,22 +171,136 @@ def entry_parser(html: HTML, max_entry: Optional[int] = None) -> Iterator[models
         is_pinned = item.attrs["data-ispinned"]
         is_pinned_on_profile = item.attrs["data-ispinnedonprofile"]
 
-        yield models.Entry(
-            int(item.attrs["data-id"]),
-            author.text,
-            content.text,
-            content.html,
-            int(favorite_count),
-            created.text,
-            topic_title.attrs["data-title"],
-            urlparse(topic_path).path.split("/")[-1],
-            True if is_pinned == "true" else False,
-            True if is_pinned_on_profile == "true" else False,
-            find_image_url(content.html),
+        content_html = content.html
+
+        yield construct(
+            entry_class,
+            project(
+                (
+                    int(item.attrs["data-id"]),
+                    author.text,
+                    content.text,
+                    content_html if keep_html else None,
+                    int(favorite_count),
+                    created.text,
+                    topic_title.attrs["data-title"],
+                    urlparse(topic_path).path.split("/")[-1],
+                    True if is_pinned == "true" else False,
+                    True if is_pinned_on_profile == "true" else False,
+                    find_image_url(content_html),
+                ),
+                fields,
+            ),
         )
 
 
-def pinned_entry_parser(topic: HTML, entry: HTML) -> models.Entry:
+def lxml_root(html: Union[HTML, Element]) -> etree._Element:
+    """Return the lxml tree of html, the one requests_html CSS selection already uses."""
+
+    return html.element if isinstance(html, Element) else html.lxml
+
+
+def lxml_first(root: etree._Element, xpath: str) -> Optional[etree._Element]:
+    found = root.xpath(xpath)
+    return found[0] if found else None
+
+
+def lxml_topic(root: etree._Element) -> tuple[str, str]:
+    h1 = lxml_first(root, 'descendant-or-self::h1[@id="title"]')
+    a = lxml_first(h1, "descendant::a")
+
+    return h1.attrib["data-title"], urlparse(a.attrib["href"]).path.split("/")[-1]
+
+
+def lxml_entry(
+    item: etree._Element,
+    topic_title: str,
+    topic_path: str,
+    compact: bool = False,
+    keep_html: bool = True,
+    fields: Optional[frozenset] = None,
+) -> models.Entry:
+    author = content = created = None
+
+    for element in item.iter("a", "div"):
+        classes = element.get("class", "").split()
+
+        if author is None and element.tag == "a" and "entry-author" in classes:
+            author = element
+        elif content is None and element.tag == "div" and "content" in classes:
+            content = element
+        elif created is None and element.tag == "a" and "entry-date" in classes:
+            created = element
+
+    if author is None or content is None or created is None:
+        raise AttributeError("Entry author, content or date element not found")
+
+    if fields is None:
+        fields = ALL_ENTRY_FIELDS
+
+    # Serializing the content is the costliest step, only html and images need it
+    if "html" in fields or "images" in fields:
+        content_html = etree.tostring(content, encoding="unicode").strip()
+    else:
+        content_html = None
+
+    return construct(
+        models.CompactEntry if compact else models.Entry,
+        (
+            int(item.attrib["data-id"]),
+            extract_text(author) if "author_nickname" in fields else None,
+            extract_text(content) if "text" in fields else None,
+            content_html if keep_html and "html" in fields else None,
+            int(item.attrib["data-favorite-count"]) if "favorite_count" in fields else None,
+            extract_text(created) if "date" in fields else None,
+            topic_title if "topic_title" in fields else None,
+            topic_path if "topic_path" in fields else None,
+            (True if item.attrib["data-ispinned"] == "true" else False) if "is_pinned" in fields else None,
+            (
+                (True if item.attrib["data-ispinnedonprofile"] == "true" else False)
+                if "is_pinned_on_profile" in fields
+                else None
+            ),
+            find_image_url(content_html) if "images" in fields else None,
+        ),
+    )
+
+
+def lxml_entry_parser(
+    html: Union[HTML, Element],
+    max_entry: Optional[int] = None,
+    compact: bool = False,
+    keep_html: bool = True,
+    fields: Optional[frozenset] = None,
+) -> Iterator[models.Entry]:
+    """Parse entrys walking the lxml tree once, topic title and path are read once per page."""
+
+    root = lxml_root(html)
+    entry_list = lxml_first(root, 'descendant-or-self::ul[@id="entry-item-list"]')
+    entry_items = (root if entry_list is None else entry_list).xpath('descendant-or-self::li[@id="entry-item"]')
+
+    if not entry_items:
+        return
+
+    topic_title, topic_path = lxml_topic(root)
+
+    for item in entry_items[:max_entry]:
+        yield lxml_entry(item, topic_title, topic_path, compact, keep_html, fields)
+
+
+def pinned_entry_parser(
+    topic: HTML,
+    entry: HTML,
+    engine: Optional[str] = None,
+    compact: bool = False,
+    keep_html: bool = True,
+    fields: Optional[frozenset] = None,
+) -> models.Entry:
+    if (engine or constants.PARSER_ENGINE) == "lxml":
+        item = lxml_first(lxml_root(entry), 'descendant-or-self::li[@id="entry-item"]')
+        title, path = lxml_topic(lxml_root(topic))
+        return lxml_entry(item, title, path, compact, keep_html, fields)
+
     entry_item = entry.find("li#entry-item", first=True)
 
     author = entry_item.find("a.entry-author", first=True)
@@ -59,16 +312,509 @@ def pinned_entry_parser(topic: HTML, entry: HTML) -> models.Entry:
     is_pinned = entry_item.attrs["data-ispinned"]
     is_pinned_on_profile = entry_item.attrs["data-ispinnedonprofile"]
 
-    return models.Entry(
-        int(entry_item.attrs["data-id"]),
-        author.text,
-        content.text,
-        content.html,
-        int(favorite_count),
-        created.text,
-        topic_title.attrs["data-title"],
-        urlparse(topic_path).path.split("/")[-1],
-        True if is_pinned == "true" else False,
-        True if is_pinned_on_profile == "true" else False,
-        find_image_url(content.html),
+    content_html = content.html
+
+    return construct(
+        models.CompactEntry if compact else models.Entry,
+        project(
+            (
+                int(entry_item.attrs["data-id"]),
+                author.text,
+                content.text,
+                content_html if keep_html else None,
+                int(favorite_count),
+                created.text,
+                topic_title.attrs["data-title"],
+                urlparse(topic_path).path.split("/")[-1],
+                True if is_pinned == "true" else False,
+                True if is_pinned_on_profile == "true" else False,
+                find_image_url(content_html),
+            ),
+            fields,
+        ),
+    )
+
+
+_parse_session = None
+
+
+def request_key(url: str, params: Optional[dict] = None) -> str:
+    """Full request URL with encoded params, the key of cached and archived responses."""
+
+    return requests.Request("GET", url, params=params).prepare().url
+
+
+def build_response(
+    status_code: int,
+    url: str,
+    content: bytes,
+    headers: Optional[dict] = None,
+    encoding: Optional[str] = None,
+    session: Optional[HTMLSession] = None,
+) -> HTMLResponse:
+    """Build an HTMLResponse from raw response parts, e.g. from a non-requests transport.
+
+    Without session a plain shared HTMLSession is attached, requests_html creates one per
+    parsed page otherwise.
+    """
+
+    global _parse_session
+
+    if session is None:
+        if _parse_session is None:
+            _parse_session = HTMLSession()
+        session = _parse_session
+
+    response = requests.Response()
+    response.status_code = status_code
+    response.url = url
+    response._content = content
+    response.headers = CaseInsensitiveDict(headers or {})
+    response.encoding = encoding or "utf-8"
+
+    return HTMLResponse._from_response(response, session)
+
+
+class SingleFlight:
+    """Run concurrent calls with the same key once, every caller gets the result (or exception).
+
+    on_shared is called with the result before it is handed to the callers that waited for it.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def do(self, key, func: Callable[..., R], *args, on_shared: Optional[Callable[[R], None]] = None) -> R:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+
+            if leader:
+                call = self._calls[key] = {"future": Future(), "waiters": 0}
+            else:
+                call["waiters"] += 1
+
+        if not leader:
+            return call["future"].result()
+
+        try:
+            result = func(*args)
+        except BaseException as e:
+            with self._lock:
+                del self._calls[key]
+
+            call["future"].set_exception(e)
+            raise
+
+        with self._lock:
+            del self._calls[key]
+
+        if call["waiters"] and on_shared is not None:
+            on_shared(result)
+
+        call["future"].set_result(result)
+
+        return result
+
+
+_memo_lock = threading.Lock()
+_parse_flight = SingleFlight()
+_MISSING = object()
+
+
+def memoize(r: HTMLResponse) -> None:
+    """Keep the models parsed from r for reuse, e.g. for a response handed to several callers."""
+
+    if getattr(r, "models", None) is None:
+        r.models = {}
+
+
+def parse(r: HTMLResponse, parser: Callable, *args):
+    """Parse r with parser, reusing the models already parsed from the same response.
+
+    Only responses kept for reuse (with a models attribute) are memoized, iterators are
+    stored as tuples and handed out as fresh iterators. Memoized models are shared by every
+    caller of the same response and must be treated as read-only.
+    """
+
+    memo = getattr(r, "models", None)
+
+    if memo is None:
+        return call_parser(r, parser, args)
+
+    key = (parser.__name__, args)
+
+    with _memo_lock:
+        result = memo.get(key, _MISSING)
+
+    if result is _MISSING:
+        # Threads parsing the same response at once share a single parse
+        result = _parse_flight.do((id(memo), key), memo_parse, r, parser, args, memo, key)
+
+    if isinstance(result, models.Topic):
+        return dataclasses.replace(result, entrys=iter(result.entrys))
+    if isinstance(result, tuple):
+        return iter(result)
+
+    return result
+
+
+def memo_parse(r: HTMLResponse, parser: Callable, args: tuple, memo: dict, key: tuple):
+    result = call_parser(r, parser, args)
+
+    if isinstance(result, models.Topic):
+        result.entrys = list(result.entrys)
+    elif isinstance(result, Iterator):
+        result = tuple(result)
+
+    with _memo_lock:
+        return memo.setdefault(key, result)
+
+
+def call_parser(r: HTMLResponse, parser: Callable, args: tuple):
+    """Call parser, timing the lxml tree construction and the parser when instrument.hooks is set."""
+
+    hooks = instrument.hooks
+
+    if hooks is None:
+        return parser(r, *args)
+
+    if r.content:
+        start = time.perf_counter()
+        r.html.lxml
+        hooks.stage("html", time.perf_counter() - start)
+
+    start = time.perf_counter()
+    result = parser(r, *args)
+    hooks.parse_end(parser.__name__, time.perf_counter() - start)
+
+    return result
+
+
+def entry_args(entry: models.Entry) -> tuple:
+    """Return the arguments entry was constructed with, a compact picklable form."""
+
+    return (
+        entry.id,
+        entry.author_nickname,
+        entry.text,
+        entry.html,
+        entry.favorite_count,
+        entry.date,
+        entry.topic_title,
+        entry.topic_path,
+        entry.is_pinned,
+        entry.is_pinned_on_profile,
+        entry.images,
     )
+
+
+def topic_entry_args(
+    status_code: int,
+    url: str,
+    content: bytes,
+    keep_html: bool = True,
+    fields: Optional[frozenset] = None,
+) -> list[tuple]:
+    """Parse a raw topic page into entry_args tuples, run in parser worker processes."""
+
+    r = build_response(status_code, url, content)
+    topic = topic_page_parser(r, compact=True, keep_html=keep_html, fields=fields)
+
+    return [entry_args(entry) for entry in topic.entrys]
+
+
+def topic_params(
+    page: int = 1,
+    action: Optional[str] = None,
+    day: Optional[str] = None,
+    author: Optional[str] = None,
+) -> dict:
+    if not isinstance(page, int):
+        raise TypeError
+
+    params = {"p": page}
+
+    if action in ("nice", "dailynice", "popular", "search"):
+        params["a"] = action
+
+    if day:
+        params["day"] = day
+
+    if author:
+        params["author"] = author
+
+    return params
+
+
+def topic_page_parser(
+    r: HTMLResponse,
+    max_entry: Optional[int] = None,
+    compact: bool = False,
+    keep_html: bool = True,
+    fields: Optional[frozenset] = None,
+) -> models.Topic:
+    if r.status_code == HTTPStatus.NOT_FOUND:
+        raise exceptions.TopicNotFound()
+
+    try:
+        h1 = r.html.find("h1#title", first=True)
+        path = h1.find("a", first=True).attrs["href"]
+        page_count = r.html.find("div.pager", first=True)
+        pinned_entry = r.html.find("div#pinned-entry", first=True)
+
+        return models.Topic(
+            int(h1.attrs["data-id"]),
+            h1.attrs["data-title"],
+            path[1:],
+            entry_parser(r.html, max_entry, compact=compact, keep_html=keep_html, fields=fields),
+            (
+                pinned_entry_parser(r.html, pinned_entry, compact=compact, keep_html=keep_html, fields=fields)
+                if pinned_entry
+                else False
+            ),
+            0 if page_count is None else int(page_count.attrs["data-pagecount"]),
+        )
+    except AttributeError as e:
+        raise exceptions.ElementNotFound(message=f"Failed to parse topic page: {e}", html=r.html.html)
+
+
+def entry_page_parser(
+    r: HTMLResponse,
+    compact: bool = False,
+    keep_html: bool = True,
+    fields: Optional[frozenset] = None,
+) -> models.Entry:
+    if r.status_code == HTTPStatus.NOT_FOUND:
+        raise exceptions.EntryNotFound()
+    if r.html.find("h1", first=True).text == exceptions.SHIT_MESSAGE:
+        raise exceptions.EntryNotFound()
+
+    try:
+        return next(entry_parser(r.html, compact=compact, keep_html=keep_html, fields=fields))
+    except AttributeError as e:
+        raise exceptions.ElementNotFound(message=f"Failed to parse entry page: {e}", html=r.html.html)
+
+
+def author_page_parser(r: HTMLResponse) -> models.Author:
+    if r.status_code == HTTPStatus.NOT_FOUND:
+        raise exceptions.AuthorNotFound()
+
+    try:
+        nickname = r.html.find("h1#user-profile-title", first=True)
+        biography = r.html.find("div#profile-biography", first=True)
+        total_entry = r.html.find("span#entry-count-total", first=True)
+        follower_count = r.html.find("span#user-follower-count", first=True)
+        following_count = r.html.find("span#user-following-count", first=True)
+        record_date = r.html.find("div.recorddate", first=True)
+        avatar_url = r.html.find("img.avatar", first=True)
+        rank = r.html.find("p.muted", first=True)
+
+        return models.Author(
+            nickname.attrs["data-nick"],
+            biography.text if biography else biography,
+            biography.html if biography else biography,
+            int(total_entry.text),
+            int(follower_count.text),
+            int(following_count.text),
+            record_date.text.title(),
+            avatar_url.attrs["src"],
+            rank,
+        )
+    except AttributeError as e:
+        raise exceptions.ElementNotFound(message=f"Failed to parse author page: {e}", html=r.html.html)
+
+
+def rank_page_parser(r: HTMLResponse) -> Optional[models.Rank]:
+    """Parse only the rank of an author page."""
+
+    if r.status_code == HTTPStatus.NOT_FOUND:
+        raise exceptions.AuthorNotFound()
+
+    rank = r.html.find("p.muted", first=True)
+
+    return None if rank is None else models.parse_rank(rank.text)
+
+
+def badges_page_parser(r: HTMLResponse) -> Iterator[models.Badge]:
+    try:
+        for badge in r.html.find("li.badge-item-otheruser"):
+            if badge.attrs["data-owned"] != "False":
+                yield models.Badge(
+                    badge.find("p", first=True).text,
+                    badge.find("a", first=True).attrs["data-title"],
+                    badge.find("img", first=True).attrs["src"],
+                )
+    except AttributeError as e:
+        raise exceptions.ElementNotFound(message=f"Failed to parse author badges page: {e}", html=r.html.html)
+
+
+def last_entrys_page_parser(r: HTMLResponse, fallback: bool = False) -> Optional[list[Union[models.Entry, int]]]:
+    """Parse author last entrys page, entry ids stand in for entrys that failed with fallback."""
+
+    try:
+        topic_list = r.html.find("div#topic", first=True)
+
+        if topic_list is None:
+            return None
+
+        entrys = []
+
+        for topic in topic_list.find("div.topic-item"):
+            entry_id = int(topic.find("li#entry-item", first=True).attrs["data-id"])
+
+            try:
+                entrys.append(next(entry_parser(topic)))
+            except (AttributeError, KeyError, StopIteration):
+                if not fallback:
+                    raise
+                entrys.append(entry_id)
+
+        return entrys
+    except (AttributeError, KeyError, StopIteration) as e:
+        raise exceptions.ElementNotFound(message=f"Failed to parse author last entrys page: {e}", html=r.html.html)
+
+
+def agenda_page_parser(r: HTMLResponse, max_topic: Optional[int] = None) -> Iterator[models.Agenda]:
+    if r.status_code != HTTPStatus.OK:
+        raise exceptions.TopicNotFound()
+
+    try:
+        topic_list = r.html.find("ul.topic-list", first=True).find("a")
+
+        for topic in topic_list[:max_topic]:
+            try:
+                a_class = topic.attrs["class"]
+                is_pinned = True if a_class == "pinned" else False
+            except KeyError:
+                is_pinned = False
+
+            yield models.Agenda(
+                topic.element.xpath("text()")[0].strip(),
+                urlparse(topic.attrs["href"]).path.split("/")[-1],
+                is_pinned,
+                topic.find("small", first=True).text,
+            )
+    except AttributeError as e:
+        raise exceptions.ElementNotFound(message=f"Failed to parse agenda page: {e}", html=r.html.html)
+
+
+def debe_page_parser(r: HTMLResponse) -> Iterator[models.Debe]:
+    if r.status_code != HTTPStatus.OK:
+        raise exceptions.EntryNotFound()
+
+    try:
+        entry_list = r.html.find("ul.topic-list", first=True).find("a")
+
+        for entry in entry_list:
+            yield models.Debe(
+                entry.find("span.caption", first=True).text,
+                urlparse(entry.attrs["href"]).path.split("/")[-1],
+            )
+    except AttributeError as e:
+        raise exceptions.ElementNotFound(message=f"Failed to parse debe page: {e}", html=r.html.html)
+
+
+def search_page_parser(r: HTMLResponse) -> Iterator[models.SearchResult]:
+    topic_ul = r.html.find("ul.topic-list", first=True)
+
+    if not topic_ul:
+        raise exceptions.SearchResultNotFound()
+
+    try:
+        topic_list = topic_ul.find("a")
+
+        for topic in topic_list:
+            yield models.SearchResult(
+                topic.element.xpath("text()")[0].strip(),
+                urlparse(topic.attrs["href"]).path.split("/")[-1],
+                topic.find("small", first=True).text if topic.find("small", first=True) else None,
+            )
+    except AttributeError as e:
+        raise exceptions.ElementNotFound(message=f"Failed to parse search topic page: {e}", html=r.html.html)
+
+
+def channel_page_parser(r: HTMLResponse, max_topic: Optional[int] = None) -> Iterator[models.ChannelTopic]:
+    try:
+        topic_list = r.html.find("ul.topic-list", first=True).find("a")
+
+        for topic in topic_list[:max_topic]:
+            yield models.ChannelTopic(
+                topic.element.xpath("text()")[0].strip(),
+                urlparse(topic.attrs["href"]).path.split("/")[-1],
+                urlparse(topic.attrs["href"]).query.split("=")[-1],
+                topic.find("small", first=True).text if topic.find("small", first=True) else None,
+            )
+    except AttributeError as e:
+        raise exceptions.ElementNotFound(message=f"Failed to parse channel page: {e}", html=r.html.html)
+
+
+def has_next_page(r: HTMLResponse) -> bool:
+    """Whether a topic list page links to a next page, by its continue link or pager."""
+
+    if r.html.find("a.quick-index-continue-link", first=True) is not None:
+        return True
+
+    pager = r.html.find("div.pager", first=True)
+
+    if pager is None:
+        return False
+
+    return int(pager.attrs.get("data-currentpage", 1)) < int(pager.attrs.get("data-pagecount", 0))
+
+
+def search_params(keywords: str) -> dict:
+    return {
+        "SearchForm.Keywords": keywords,
+        "SearchForm.NiceOnly": "false",
+        "SearchForm.SortOrder": "Count",
+    }
+
+
+def check_channel(path: str) -> None:
+    if not path in [channel.path for channel in constants.CHANNELS]:
+        raise exceptions.ChannelNotFound()
+
+
+def bounded_map(func: Callable[[T], R], items: Iterable[T], workers: int = 4, ordered: bool = True) -> Iterator[R]:
+    """Run func over items in a thread pool with at most workers * 2 pending calls.
+
+    Results are yielded in input order if ordered, otherwise as they complete.
+    """
+
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+
+    items = iter(items)
+    pending = deque()
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+
+        def fill():
+            while len(pending) < workers * 2:
+                try:
+                    pending.append(executor.submit(contextvars.copy_context().run, func, next(items)))
+                except StopIteration:
+                    return
+
+        fill()
+
+        try:
+            while pending:
+                if ordered:
+                    yield pending.popleft().result()
+                else:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+
+                    for future in done:
+                        pending.remove(future)
+                        yield future.result()
+
+                fill()
+        finally:
+            for future in pending:
+                future.cancel()
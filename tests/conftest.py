@@ -0,0 +1,36 @@
+import threading
+
+import pytest
+
+from src.limoon import constants, core
+
+from .replay import ReplayAdapter, ReplayServer
+
+
+@pytest.fixture
+def replay(monkeypatch):
+    """Answer core.session requests from tests/fixtures."""
+
+    adapter = ReplayAdapter()
+    monkeypatch.setattr(core, "limiter", None)
+    monkeypatch.setattr(core.session, "adapters", {})
+    core.session.mount("https://", adapter)
+    core.session.mount("http://", adapter)
+
+    return adapter
+
+
+@pytest.fixture
+def replay_server(monkeypatch):
+    """Answer requests to constants.BASE_URL from tests/fixtures over local HTTP."""
+
+    server = ReplayServer(ReplayAdapter())
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(core, "limiter", None)
+    monkeypatch.setattr(constants, "BASE_URL", server.url)
+
+    yield server
+
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,78 @@
+import json
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import unquote, urlparse
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+class ReplayAdapter(BaseAdapter):
+    """Transport adapter answering requests from saved pages instead of the network.
+
+    Pages are looked up in the directory index.json by URL path and query, then by path alone,
+    unknown paths get 404.
+    """
+
+    def __init__(self, directory: Path = FIXTURES):
+        super().__init__()
+        self.directory = directory
+        self.index = json.loads((directory / "index.json").read_text())
+        self.requests = []
+
+    def page(self, url: str) -> tuple:
+        """Return status code and content of the saved page for url."""
+
+        self.requests.append(url)
+        parts = urlparse(url)
+        path = unquote(parts.path)
+        name = self.index.get(f"{path}?{unquote(parts.query)}", self.index.get(path))
+
+        if name is None:
+            return HTTPStatus.NOT_FOUND, "<html><body><h1>büyük başarısızlıklar sözkonusu</h1></body></html>".encode()
+
+        return HTTPStatus.OK, (self.directory / name).read_bytes()
+
+    def send(self, request, **kwargs):
+        response = requests.Response()
+        response.request = request
+        response.url = request.url
+        response.encoding = "utf-8"
+        response.headers = CaseInsensitiveDict({"Content-Type": "text/html; charset=utf-8"})
+        response.status_code, response._content = self.page(request.url)
+
+        return response
+
+    def close(self):
+        pass
+
+
+class ReplayServer(ThreadingHTTPServer):
+    """Local HTTP server answering from saved pages, for clients not built on requests."""
+
+    def __init__(self, adapter: ReplayAdapter):
+        self.adapter = adapter
+        super().__init__(("127.0.0.1", 0), ReplayHandler)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_port}"
+
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        status_code, content = self.server.adapter.page(self.server.url + self.path)
+
+        self.send_response(status_code)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args):
+        pass
@@ -1,9 +1,25 @@
+import asyncio
+import csv
+import io
+import json
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import asdict
 from datetime import datetime
+from pathlib import Path
 from types import NoneType
 
 import pytest
 
 from src import limoon
+from src.limoon import aio, caching, core, export, follow, index, instrument, scan, throttle, utils
+
+from .replay import ReplayAdapter
+
+
+FIXTURES = Path(__file__).parent / "fixtures"
 
 
 class TestAPI:
@@ -30,6 +46,13 @@ class TestAPI:
         assert entrys[1].author_nickname == "hooker with a penis"
         assert "linux çekirdektir." in entrys[1].text
 
+    def test_get_topic_pages(self):
+        entrys = list(limoon.get_topic_pages("linux--32084", pages=3, workers=2))
+
+        assert len(entrys) == 30
+        assert all(type(entry) is limoon.Entry for entry in entrys)
+        assert entrys[0].id < entrys[10].id < entrys[20].id
+
     def test_get_entry(self):
         entry = limoon.get_entry(1)
 
@@ -112,6 +135,57 @@ class TestAPI:
         assert search_result.url == "https://eksisozluk.com/linux--32084"
 
 
+class TestAsyncAPI:
+    def test_get_topic(self):
+        topic = asyncio.run(aio.get_topic("linux--32084"))
+
+        assert type(topic) is limoon.Topic
+        assert topic.id == 32084
+        assert topic.path == "linux--32084"
+
+    def test_get_entry(self):
+        async def get_entrys():
+            return await asyncio.gather(aio.get_entry(1), aio.get_entry(2))
+
+        entrys = asyncio.run(get_entrys())
+
+        assert [entry.id for entry in entrys] == [1, 2]
+        assert entrys[0].author_nickname == "ssg"
+
+    def test_get_debe(self):
+        async def get_debe():
+            return [debe async for debe in aio.get_debe()]
+
+        assert type(asyncio.run(get_debe())[0]) is limoon.Debe
+
+
+class TestAsyncReplay:
+    def test_separate_event_loops(self, replay_server):
+        async def get_debe():
+            try:
+                return [debe async for debe in aio.get_debe()]
+            finally:
+                await aio.close()
+
+        async def get_entry():
+            return await aio.get_entry(1)
+
+        assert len(asyncio.run(get_debe())) > 0
+        assert asyncio.run(get_entry()).id == 1
+        assert asyncio.run(get_entry()).author_nickname == "ssg"
+        assert replay_server.adapter.requests[0] == replay_server.url + "/debe"
+
+    def test_session_per_loop(self):
+        async def get_sessions():
+            return aio.get_session(), aio.get_session()
+
+        first, same = asyncio.run(get_sessions())
+        second, _ = asyncio.run(get_sessions())
+
+        assert first is same
+        assert first is not second
+
+
 class TestException:
     def test_topic_not_found(self):
         with pytest.raises(limoon.TopicNotFound):
@@ -128,3 +202,876 @@ class TestException:
     def test_author_not_found(self):
         with pytest.raises(limoon.AuthorNotFound):
             limoon.get_author("böylebirkullanıcıyok")
+
+
+class TestCache:
+    def response(self, url="https://eksisozluk.com/debe"):
+        return utils.build_response(200, url, b"<html><body>debe</body></html>")
+
+    def test_route_ttl(self):
+        cache = limoon.MemoryCache(ttl={limoon.constants.DEBE_ROUTE: 7})
+
+        assert cache.ttl_for("/debe") == 7
+        assert cache.ttl_for("/entry/1") == limoon.constants.CACHE_TTL[limoon.constants.ENTRY_ROUTE]
+        assert cache.ttl_for("/linux--32084") == limoon.constants.CACHE_TTL[limoon.constants.TOPIC_ROUTE]
+
+    def test_custom_route_ttl(self):
+        cache = limoon.MemoryCache(ttl={"/basliklar/bugun": 5, "/{}": 9}, default_ttl=999)
+
+        assert cache.ttl_for("/basliklar/bugun") == 5
+        assert cache.ttl_for("/linux--32084") == 9
+        assert cache.ttl_for("/entry/1") == limoon.constants.CACHE_TTL[limoon.constants.ENTRY_ROUTE]
+
+    def test_default_ttl(self):
+        cache = limoon.MemoryCache(default_ttl=999)
+
+        assert cache.ttl_for("/basliklar/bugun") == 999
+        assert cache.ttl_for("/basliklar/kanal/teknoloji") == limoon.constants.CACHE_TTL[limoon.constants.CHANNEL_ROUTE]
+
+    def test_abstract_cache(self):
+        class IncompleteCache(caching.Cache):
+            def _get(self, key, now):
+                return None
+
+        with pytest.raises(TypeError):
+            IncompleteCache()
+
+    def test_memory_cache_lru(self):
+        cache = limoon.MemoryCache(maxsize=2)
+
+        for key in ("a", "b", "c"):
+            cache.set(key, "/debe", self.response())
+
+        assert cache.get("a") is None
+        assert cache.get("c") is not None
+        assert cache.stats == caching.CacheStats(hits=1, misses=1, size=2)
+
+    def test_sqlite_cache(self, tmp_path):
+        path = str(tmp_path / "cache.sqlite")
+        limoon.SQLiteCache(path).set("debe", "/debe", self.response())
+        r = limoon.SQLiteCache(path).get("debe")
+
+        assert r.status_code == 200
+        assert r.html.find("body", first=True).text == "debe"
+
+    def test_expired(self):
+        cache = limoon.MemoryCache(ttl={limoon.constants.DEBE_ROUTE: 0})
+        cache.set("debe", "/debe", self.response())
+
+        assert cache.get("debe") is None
+
+
+class TestRevalidator:
+    def response(self, status_code=200, headers={"ETag": '"1"'}):
+        html = (
+            b'<html><body><ul class="topic-list">'
+            b'<a href="/entry/1"><span class="caption">pena</span></a>'
+            b"</ul></body></html>"
+        )
+        return utils.build_response(status_code, "https://eksisozluk.com/debe", html, headers)
+
+    def test_conditional_headers(self):
+        revalidator = limoon.Revalidator()
+
+        assert revalidator.headers("debe") == {}
+        revalidator.update("debe", self.response())
+        assert revalidator.headers("debe") == {"If-None-Match": '"1"'}
+
+    def test_not_modified_reuses_models(self):
+        revalidator = limoon.Revalidator()
+        r = revalidator.update("debe", self.response())
+        debe = list(utils.parse(r, utils.debe_page_parser))
+        r = revalidator.update("debe", self.response(304, {}))
+
+        assert r.status_code == 200
+        assert list(utils.parse(r, utils.debe_page_parser))[0] is debe[0]
+        assert (revalidator.revalidated, revalidator.downloaded) == (1, 1)
+
+
+class TestParser:
+    def html(self):
+        return utils.build_response(
+            200, "https://eksisozluk.com/linux--32084", (FIXTURES / "topic.html").read_bytes()
+        ).html
+
+    def test_engines_identical(self):
+        html = self.html()
+        expected = [asdict(entry) for entry in utils.entry_parser(html, engine="requests_html")]
+
+        assert len(expected) == 10
+        assert [asdict(entry) for entry in utils.entry_parser(html, engine="lxml")] == expected
+
+    def test_compact_entry(self):
+        html = self.html()
+
+        for entry, compact in zip(utils.entry_parser(html), utils.entry_parser(html, compact=True, keep_html=False)):
+            assert type(compact) is limoon.CompactEntry
+            assert compact.html is None
+            assert not hasattr(compact, "__dict__")
+
+            for name in ("id", "text", "date", "images", "created", "edited", "url", "images_source"):
+                assert getattr(compact, name) == getattr(entry, name)
+
+    def test_max_entry(self):
+        assert len(list(utils.entry_parser(self.html(), max_entry=3, engine="lxml"))) == 3
+
+    @pytest.mark.parametrize("engine", ["requests_html", "lxml"])
+    def test_fields(self, engine):
+        html = self.html()
+        fields = utils.entry_fields(["text", "created"])
+
+        for entry, projected in zip(utils.entry_parser(html), utils.entry_parser(html, engine=engine, fields=fields)):
+            assert (projected.id, projected.text, projected.created) == (entry.id, entry.text, entry.created)
+            assert projected.html is projected.images is projected.images_source is projected.author_nickname is None
+
+    def test_fields_without_date(self):
+        entry = next(utils.entry_parser(self.html(), compact=True, fields=utils.entry_fields(["images"])))
+
+        assert entry.date is entry.created is entry.edited is entry.images_source is None
+
+    def test_entry_fields(self):
+        assert utils.entry_fields(None) is None
+        assert utils.entry_fields(["images_source", "url"]) == {"id", "images", "date"}
+
+        with pytest.raises(ValueError):
+            utils.entry_fields(["title"])
+
+
+class TestReplay:
+    def test_get_topic(self, replay):
+        topic = limoon.get_topic("linux--32084")
+        entrys = list(topic.entrys)
+
+        assert topic.id == 32084
+        assert topic.page_count == 2000
+        assert len(entrys) == 10
+        assert entrys[3].images_source == ["https://cdn.eksisozluk.com/2022/12/5/h/hw9d8bdw.jpg"]
+
+    def test_get_topic_pages(self, replay):
+        entrys = list(limoon.get_topic_pages("linux--32084", pages=3, workers=2))
+
+        assert len(entrys) == 22
+        assert [entry.id for entry in entrys[9:13]] == [entrys[9].id, 190000001, 190000002, entrys[0].id]
+        assert sorted(request[-3:] for request in replay.requests) == ["p=1", "p=2", "p=3"]
+
+    def test_get_topic_pages_processes(self, replay):
+        entrys = list(limoon.get_topic_pages("linux--32084", pages=3, workers=2))
+
+        assert list(limoon.get_topic_pages("linux--32084", pages=3, workers=2, processes=2)) == entrys
+
+    def test_get_entry(self, replay):
+        entry = limoon.get_entry(1)
+
+        assert entry.author_nickname == "ssg"
+        assert entry.topic_path == "pena--31782"
+        assert entry.created == datetime(1999, 2, 15)
+
+    def test_get_entries(self, replay):
+        results = list(limoon.get_entries([1, 2, 1, "1"], workers=2))
+
+        assert [entry_id for entry_id, _ in results] == [1, 2]
+        assert results[0][1] == limoon.get_entry(1)
+        assert type(results[1][1]) is limoon.EntryNotFound
+        assert len(replay.requests) == 3
+
+    def test_get_fields(self, replay):
+        entry = limoon.get_entry(1, fields=["author_nickname"])
+        entrys = list(limoon.get_topic_pages("linux--32084", pages=2, fields=("favorite_count",), processes=1))
+
+        assert (entry.id, entry.author_nickname, entry.text) == (1, "ssg", None)
+        assert len(entrys) == 12
+        assert all(entry.favorite_count is not None and entry.text is None for entry in entrys)
+
+    def test_get_entries_as_completed(self, replay):
+        results = dict(limoon.get_entries(range(1, 5), workers=4, ordered=False))
+
+        assert sorted(results) == [1, 2, 3, 4]
+        assert sum(isinstance(result, limoon.Entry) for result in results.values()) == 1
+
+    def test_get_author(self, replay):
+        author = limoon.get_author("ssg")
+
+        assert author.total_entry == 12345
+        assert author.record_date == "Şubat 1999"
+        assert author.rank == limoon.Rank("kırmızı piyade", 9999)
+
+    def test_get_author_rank(self, replay):
+        assert limoon.get_author_rank("ssg") == limoon.Rank("kırmızı piyade", 9999)
+        assert len(replay.requests) == 1
+
+    def test_get_author_topic(self, replay):
+        assert limoon.get_author_topic("ssg").path == "linux--32084"
+        assert replay.requests == ["https://eksisozluk.com/biri/ssg/usertopic"]
+
+    def test_get_author_profile(self, replay):
+        profile = limoon.get_author_profile("ssg")
+
+        assert profile.author == limoon.get_author("ssg")
+        assert profile.rank == limoon.Rank("kırmızı piyade", 9999)
+        assert [badge.name for badge in profile.badges] == ["çaylak", "müptela", "kutsal"]
+        assert profile.topic.id == 32084
+        assert len(replay.requests) == 4
+
+    def test_get_author_profile_include(self, replay):
+        profile = limoon.get_author_profile("ssg", include=["rank"])
+
+        assert (profile.author, profile.badges, profile.topic) == (None, None, None)
+        assert profile.rank.karma == 9999
+        assert len(replay.requests) == 1
+
+        with pytest.raises(ValueError):
+            limoon.get_author_profile("ssg", include=["entrys"])
+
+    def test_get_author_badges(self, replay):
+        assert [badge.name for badge in limoon.get_author_badges("ssg")] == ["çaylak", "müptela", "kutsal"]
+
+    def test_get_agenda(self, replay):
+        agenda = list(limoon.get_agenda(max_topic=2))
+
+        assert [topic.path for topic in agenda] == [
+            "eksi-sozluk-yazarlarinin-bugun-yaptiklari--2580742",
+            "linux--32084",
+        ]
+        assert agenda[1].entry_count == "128"
+
+    def test_get_agenda_pages(self, replay):
+        agenda = list(limoon.get_agenda_pages())
+
+        assert len(agenda) == 7
+        assert [topic.path for topic in agenda[4:]] == [
+            "ankarada-sonbahar--7766555",
+            "mekanik-klavye--2301871",
+            "istanbulda-trafik--7766560",
+        ]
+        assert sorted(request[-3:] for request in replay.requests)[:2] == ["p=1", "p=2"]
+
+    def test_get_agenda_pages_max_topic(self, replay):
+        assert len(list(limoon.get_agenda_pages(max_topic=6, workers=1))) == 6
+        assert len(list(limoon.get_agenda_pages(max_topic=3, pages=1))) == 3
+        assert list(limoon.get_agenda_pages(max_topic=0)) == []
+
+    def test_get_channel_pages(self, replay):
+        assert list(limoon.get_channel_pages("teknoloji")) == list(limoon.get_channel("teknoloji"))
+        assert replay.requests[-1].endswith("/basliklar/kanal/teknoloji?p=1")
+
+    def test_get_debe(self, replay):
+        assert [debe.id for debe in limoon.get_debe()] == ["170000010", "170000011", "170000012"]
+
+    def test_get_search_topic(self, replay):
+        search_results = list(limoon.get_search_topic("linux"))
+
+        assert search_results[0].path == "linux--32084"
+        assert search_results[3].entry_count is None
+
+    def test_get_channel(self, replay):
+        channel_topics = list(limoon.get_channel("teknoloji"))
+
+        assert channel_topics[0].day == "2026-10-18"
+        assert channel_topics[2].entry_count is None
+
+    def test_get_author_last_entrys(self, replay):
+        with pytest.raises(limoon.ElementNotFound):
+            list(limoon.get_author_last_entrys("ssg"))
+
+        assert replay.requests == ["https://eksisozluk.com/son-entryleri?nick=ssg&p=1"]
+
+    def test_get_author_last_entrys_fallback(self, replay):
+        entrys = list(limoon.get_author_last_entrys("ssg", fallback=True))
+
+        assert [entry.id for entry in entrys] == [30271, 1]
+        assert entrys[0].topic_path == "linux--32084"
+        assert entrys[1].topic_path == "pena--31782"
+        assert sorted(replay.requests[1:]) == ["https://eksisozluk.com/entry/1", "https://eksisozluk.com/entry/2"]
+
+    def test_last_entrys_missing_attribute(self):
+        html = (FIXTURES / "lastentrys.html").read_text()
+        html = html[: html.index('<div class="topic-item">')] + html[html.rindex('<div class="topic-item">') :]
+        r = utils.build_response(200, "https://eksisozluk.com/son-entryleri", html.encode())
+
+        with pytest.raises(limoon.ElementNotFound):
+            utils.last_entrys_page_parser(r)
+
+        assert utils.last_entrys_page_parser(r, fallback=True) == [2]
+
+    def test_not_found(self, replay):
+        with pytest.raises(limoon.EntryNotFound):
+            limoon.get_entry(2)
+
+
+class TestImport:
+    def test_lazy_import(self):
+        code = (
+            "import sys; from src import limoon; "
+            "print([m for m in ('requests_html', 'fake_useragent') if m in sys.modules])"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], cwd=Path(__file__).parent.parent, capture_output=True, text=True
+        )
+
+        assert result.stdout.strip() == "[]"
+
+    def test_lazy_attributes(self):
+        assert limoon.get_topic is limoon.core.get_topic
+        assert limoon.MemoryCache is caching.MemoryCache
+        assert "User-Agent" in limoon.HEADERS
+
+    def test_headers_without_core(self):
+        code = "import sys; from src import limoon; limoon.HEADERS; print('requests_html' in sys.modules)"
+        result = subprocess.run(
+            [sys.executable, "-c", code], cwd=Path(__file__).parent.parent, capture_output=True, text=True
+        )
+
+        assert result.stdout.strip() == "False"
+
+    @pytest.mark.parametrize("name", ["random", "requests", "limiter", "cache"])
+    def test_private_names(self, name):
+        with pytest.raises(AttributeError):
+            getattr(limoon, name)
+
+
+class TestDate:
+    def strptime_datetime(self, stuff):
+        def parse_single(value):
+            for fmt in ("%d.%m.%Y %H:%M", "%d.%m.%Y"):
+                try:
+                    return datetime.strptime(value.strip(), fmt)
+                except ValueError:
+                    continue
+            raise ValueError(value)
+
+        if "~" not in stuff:
+            return parse_single(stuff), False
+
+        created_str, edited_str = map(str.strip, stuff.split("~"))
+        created = parse_single(created_str)
+
+        if not edited_str:
+            return created, False
+        if "." in edited_str:
+            return created, parse_single(edited_str)
+        return created, datetime.strptime(f"{created.strftime('%d.%m.%Y')} {edited_str}", "%d.%m.%Y %H:%M")
+
+    @pytest.mark.parametrize(
+        "stuff",
+        [
+            "15.02.1999",
+            "05.12.2022 13:37",
+            "03.11.2001 ~ 04.11.2001 09:15",
+            "05.12.2022 13:37 ~ 14:05",
+            "01.02.2023 ~ 02.02.2023",
+            "30.09.2023 23:59 ~ 00:10",
+            "12.08.2024 ~ ",
+            " 1.2.2024 ",
+            "01.02.2024  10:00",
+            "01.02.2024 10:00 ~ 9:05",
+        ],
+    )
+    def test_identical_to_strptime(self, stuff):
+        assert limoon.Entry._parse_datetime(stuff) == self.strptime_datetime(stuff)
+
+    @pytest.mark.parametrize("stuff", ["31.02.2024", "01.02.2024 24:00", "01.02.2024 ~ 25:00", "yesterday"])
+    def test_invalid(self, stuff):
+        with pytest.raises(ValueError):
+            limoon.Entry._parse_datetime(stuff)
+
+
+class FlakyAdapter(ReplayAdapter):
+    def __init__(self, status_codes):
+        super().__init__()
+        self.status_codes = list(status_codes)
+
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+
+        if self.status_codes:
+            response.status_code = self.status_codes.pop(0)
+            response.headers["Retry-After"] = "0"
+
+        return response
+
+
+class TestThrottle:
+    def flaky(self, monkeypatch, status_codes):
+        adapter = FlakyAdapter(status_codes)
+        monkeypatch.setattr(core, "limiter", throttle.RateLimiter(rate=1000, burst=1000))
+        monkeypatch.setattr(core.session, "adapters", {})
+        core.session.mount("https://", adapter)
+
+        return adapter
+
+    def test_token_bucket(self):
+        bucket = throttle.TokenBucket(rate=10, capacity=2)
+
+        assert bucket.reserve() == 0
+        assert bucket.reserve() == 0
+        assert 0 < bucket.reserve() <= 0.1
+
+    def test_concurrent_rate_updates(self):
+        limiter = throttle.RateLimiter(rate=1, max_rate=10_000, increase=1)
+        list(utils.bounded_map(lambda _: limiter.success("eksisozluk.com"), range(1000), workers=8))
+
+        assert limiter.bucket("eksisozluk.com").rate == 1001
+
+    def test_adaptive_rate(self):
+        limiter = throttle.RateLimiter(rate=4, min_rate=1, max_rate=5, increase=1)
+        limiter.failure("eksisozluk.com")
+        assert limiter.bucket("eksisozluk.com").rate == 2
+        limiter.success("eksisozluk.com")
+        assert limiter.bucket("eksisozluk.com").rate == 3
+
+    def test_retry_after(self):
+        assert throttle.backoff(5, "2") == 2
+        assert 0 <= throttle.backoff(1) <= 1
+
+    def test_retry(self, monkeypatch):
+        adapter = self.flaky(monkeypatch, [429, 503])
+
+        assert limoon.get_entry(1).id == 1
+        assert len(adapter.requests) == 3
+        assert core.limiter.bucket("eksisozluk.com").rate < 1000
+
+    def test_rate_limited(self, monkeypatch):
+        self.flaky(monkeypatch, [429] * (limoon.constants.RETRIES + 1))
+
+        with pytest.raises(limoon.RateLimited):
+            limoon.get_entry(1)
+
+
+class TestClient:
+    def client(self, monkeypatch, **kwargs):
+        client = limoon.Client(**kwargs)
+        adapter = ReplayAdapter()
+        monkeypatch.setattr(core, "limiter", None)
+        client.session.mount("https://", adapter)
+        client.session.mount("http://", adapter)
+
+        return client, adapter
+
+    def test_own_session(self, monkeypatch, replay):
+        client, adapter = self.client(monkeypatch, base_url="https://eksisozluk1923.com")
+
+        assert client.get_entry(1).id == 1
+        assert adapter.requests == ["https://eksisozluk1923.com/entry/1"]
+        assert replay.requests == []
+
+        limoon.get_entry(1)
+        assert len(adapter.requests) == 1
+        assert replay.requests == ["https://eksisozluk.com/entry/1"]
+
+    def test_generator_and_workers(self, monkeypatch, replay):
+        client, adapter = self.client(monkeypatch)
+
+        assert len(list(client.get_agenda())) > 0
+        assert len(list(client.get_topic_pages("linux--32084", pages=3))) == 22
+        assert len(adapter.requests) == 4
+        assert replay.requests == []
+
+    def test_per_thread(self):
+        client = limoon.Client(per_thread=True)
+        sessions = list(utils.bounded_map(lambda _: client.session, range(8), workers=2))
+
+        assert client.session not in sessions
+        assert 1 <= len({id(session) for session in sessions}) <= 2
+
+        client.close()
+
+    def test_not_core_function(self):
+        with pytest.raises(AttributeError):
+            limoon.Client().use_client
+
+
+class TestTopicFollower:
+    def test_first_poll(self, replay):
+        follower = limoon.TopicFollower(["linux--32084"])
+
+        assert list(follower.poll()) == []
+        assert follower.checkpoints["linux--32084"] == follow.TopicCheckpoint("linux--32084", 180000003, 2000)
+        assert [request.split("?")[1] for request in replay.requests] == ["p=1", "p=2000"]
+
+    def test_new_entrys(self, replay):
+        follower = limoon.TopicFollower(["linux--32084"])
+        follower.checkpoints["linux--32084"] = follow.TopicCheckpoint("linux--32084", 152345678, 2000)
+
+        assert [entry.id for entry in follower.poll()] == [160000001, 170000002, 180000003]
+        assert list(follower.poll()) == []
+        assert len(replay.requests) == 2
+
+    def test_new_pages(self, replay):
+        follower = limoon.TopicFollower(["linux--32084"])
+        follower.checkpoints["linux--32084"] = follow.TopicCheckpoint("linux--32084", 180000003, 1998)
+
+        assert [entry.id for entry in follower.poll()] == [190000001, 190000002]
+        assert follower.checkpoints["linux--32084"] == follow.TopicCheckpoint("linux--32084", 190000002, 2000)
+        assert [request.split("?")[1] for request in replay.requests] == ["p=1998", "p=1999", "p=2000"]
+
+    def test_persisted(self, replay, tmp_path):
+        path = str(tmp_path / "checkpoints.json")
+        list(limoon.TopicFollower(["linux--32084"], path=path).poll())
+        follower = limoon.TopicFollower(path=path)
+
+        assert follower.topics == ["linux--32084"]
+        assert follower.checkpoints["linux--32084"].entry_id == 180000003
+
+
+class TestExport:
+    def test_jsonl(self, replay, tmp_path):
+        path = str(tmp_path / "entrys.jsonl")
+
+        assert export.write_jsonl(limoon.get_topic("linux--32084").entrys, path, batch_size=3) == 10
+
+        rows = [json.loads(line) for line in Path(path).read_text().splitlines()]
+        assert rows[0]["id"] == 1
+        assert rows[0]["created"] == "1999-02-15T00:00:00"
+        assert rows[3]["images_source"] == ["https://cdn.eksisozluk.com/2022/12/5/h/hw9d8bdw.jpg"]
+
+    def test_compact_identical(self, replay):
+        entrys, compact_entrys = io.StringIO(), io.StringIO()
+        export.write_jsonl(limoon.get_topic("linux--32084").entrys, entrys)
+        export.write_jsonl(limoon.get_topic("linux--32084", compact=True).entrys, compact_entrys)
+
+        assert entrys.getvalue() == compact_entrys.getvalue()
+
+    def test_csv(self, replay):
+        output = io.StringIO()
+
+        assert export.write_csv(limoon.get_agenda(), output) == len(list(limoon.get_agenda()))
+
+        rows = list(csv.DictReader(io.StringIO(output.getvalue())))
+        assert list(rows[0]) == ["title", "path", "is_pinned", "entry_count", "url"]
+        assert rows[1]["path"] == "linux--32084"
+
+    def test_empty(self, tmp_path):
+        assert export.write_jsonl(iter(()), str(tmp_path / "empty.jsonl")) == 0
+
+    @pytest.mark.parametrize("format", ["parquet", "arrow"])
+    def test_arrow(self, replay, tmp_path, format):
+        pa = pytest.importorskip("pyarrow")
+        path = str(tmp_path / f"entrys.{format}")
+
+        assert export.write_arrow(limoon.get_topic("linux--32084").entrys, path, batch_size=4, format=format) == 10
+
+        if format == "parquet":
+            import pyarrow.parquet as pq
+
+            table = pq.read_table(path)
+        else:
+            table = pa.ipc.open_stream(path).read_all()
+
+        assert table.num_rows == 10
+        assert table.column("id").to_pylist()[:2] == [1, 30271]
+        assert table.schema.field("edited").type == pa.timestamp("us")
+
+
+class TestStore:
+    def store(self):
+        store = limoon.EntryStore()
+        store.upsert(limoon.get_topic("linux--32084").entrys)
+        store.upsert([limoon.get_entry(1)])
+
+        return store
+
+    def test_upsert(self, replay):
+        store = self.store()
+
+        assert len(store) == 10
+        assert store.get(1).topic_path == "pena--31782"
+        assert store.get(1) == limoon.get_entry(1)
+        assert store.get(2) is None
+
+    def test_find(self, replay):
+        store = self.store()
+
+        assert [entry.id for entry in store.find(author="ssg")] == [1]
+        assert len(list(store.find(topic_path="linux--32084"))) == 9
+        assert [entry.id for entry in store.find(end=datetime(2002, 1, 1))] == [1, 30271, 118245]
+        assert len(list(store.find(start=datetime(2000, 1, 1), limit=2))) == 2
+
+    def test_search(self, replay):
+        store = self.store()
+
+        assert [entry.id for entry in store.search("gitar")] == [1]
+        assert 30271 in [entry.id for entry in store.search("cekirdek*")]
+        assert list(store.search("gitar", topic_path="linux--32084")) == []
+
+    def test_compact(self, replay):
+        store = self.store()
+        store.compact = True
+
+        assert type(store.get(1)) is limoon.CompactEntry
+
+
+class TestArchive:
+    def test_record_and_replay(self, replay, monkeypatch, tmp_path):
+        monkeypatch.setattr(core, "archive", limoon.Archive(str(tmp_path)))
+        topic = limoon.get_topic("linux--32084")
+        entrys = list(topic.entrys)
+        entry = limoon.get_entry(1)
+        core.archive.close()
+
+        monkeypatch.setattr(core, "archive", limoon.Archive(str(tmp_path), "replay"))
+        replay.requests.clear()
+
+        with limoon.request_stats() as stats:
+            assert list(limoon.get_topic("linux--32084").entrys) == entrys
+            assert limoon.get_entry(1) == entry
+
+        assert replay.requests == []
+        assert stats.replayed == 2
+
+        with pytest.raises(limoon.NotArchived):
+            limoon.get_entry(2)
+
+    def test_segments(self, tmp_path):
+        archive = limoon.Archive(str(tmp_path), segment_size=1)
+
+        for page in range(3):
+            archive.append(f"/debe?p={page}", utils.build_response(200, "https://eksisozluk.com/debe", b"debe"))
+
+        archive.append("/debe?p=0", utils.build_response(404, "https://eksisozluk.com/debe", b"yok"))
+
+        assert len(archive) == 3
+        assert len(list(tmp_path.glob("*.seg"))) == 4
+        assert [key for key, _ in archive.responses()] == ["/debe?p=1", "/debe?p=2", "/debe?p=0"]
+        assert archive.get("/debe?p=0").status_code == 404
+        assert archive.get("/debe?p=1").content == b"debe"
+        assert archive.get("/debe?p=3") is None
+
+
+class TestInstrument:
+    def test_metrics(self, replay, monkeypatch):
+        metrics = instrument.Metrics()
+        monkeypatch.setattr(instrument, "hooks", metrics)
+        entrys = list(limoon.get_topic("linux--32084").entrys)
+        snapshot = metrics.snapshot()
+
+        assert len(entrys) == 10
+        assert snapshot["counters"]["requests"] == snapshot["counters"]["status_200"] == 1
+        assert snapshot["counters"]["entrys"] == 10
+        assert snapshot["counters"]["bytes"] == len((FIXTURES / "topic.html").read_bytes())
+        assert snapshot["histograms"]["model"]["count"] == 10
+        assert snapshot["histograms"]["entry_parser_lxml"]["count"] == 1
+
+        for name in ("request", "html", "topic_page_parser"):
+            assert snapshot["histograms"][name]["count"] == 1
+
+    def test_hooks(self, replay, monkeypatch):
+        class RecordingHooks(instrument.Hooks):
+            def __init__(self):
+                self.events = []
+
+            def request_start(self, url):
+                self.events.append(("request_start", url))
+
+            def request_end(self, event):
+                self.events.append(("request_end", event.status_code))
+
+        hooks = RecordingHooks()
+        monkeypatch.setattr(instrument, "hooks", hooks)
+
+        with pytest.raises(limoon.EntryNotFound):
+            limoon.get_entry(2)
+
+        assert hooks.events == [("request_start", "https://eksisozluk.com/entry/2"), ("request_end", 404)]
+
+    def test_timings(self):
+        assert instrument.timings(None) == {}
+        assert instrument.timings({"namelookup_time": 1500, "appconnect_time": 20000, "total_time": 1}) == {
+            "namelookup": 0.0015,
+            "appconnect": 0.02,
+        }
+
+    def test_histogram(self):
+        histogram = instrument.Histogram((0.1, 1))
+
+        for value in (0.05, 0.5, 0.7, 5):
+            histogram.observe(value)
+
+        assert histogram.counts == [1, 2, 1]
+        assert histogram.mean == pytest.approx(1.5625)
+
+
+class TestScanner:
+    def test_scan(self, replay, tmp_path):
+        scanner = limoon.EntryScanner(str(tmp_path), start=1, end=6, shard_size=2, workers=2)
+
+        assert [entry.id for entry in scanner.scan()] == [1]
+        assert [(shard.start, shard.end) for shard in scanner.shards()] == [(1, 3), (3, 5), (5, 6)]
+        assert all(checkpoint.done for checkpoint in scanner.checkpoints())
+        assert list(scanner.load(scan.Shard(1, 3)).found) == [1]
+        assert list(scanner.load(scan.Shard(1, 3)).missing) == [2]
+        assert list(tmp_path.glob("*.claim")) == []
+
+    def test_resume(self, replay, tmp_path):
+        scanner = limoon.EntryScanner(str(tmp_path), start=1, end=5, shard_size=2, workers=1)
+        entrys = scanner.scan()
+        next(entrys)
+        entrys.close()
+        replay.requests.clear()
+
+        assert [entry.id for entry in limoon.EntryScanner(str(tmp_path), start=1, end=5, shard_size=2).scan()] == [1]
+        assert sorted(replay.requests) == [f"https://eksisozluk.com/entry/{entry_id}" for entry_id in range(1, 5)]
+
+    def test_claims(self, replay, tmp_path):
+        first = limoon.EntryScanner(str(tmp_path), start=1, end=5, shard_size=2)
+        second = limoon.EntryScanner(str(tmp_path), start=1, end=5, shard_size=2, claim_ttl=0)
+
+        assert first.claim() == scan.Shard(1, 3)
+        assert limoon.EntryScanner(str(tmp_path), start=1, end=5, shard_size=2).claim() == scan.Shard(3, 5)
+        assert second.claim() == scan.Shard(1, 3)
+
+    def test_bitmap(self):
+        bitmap = scan.Bitmap(100)
+
+        for value in (100, 107, 108, 5000):
+            bitmap.add(value)
+
+        restored = scan.Bitmap.from_text(100, bitmap.to_text())
+
+        assert list(restored) == [100, 107, 108, 5000]
+        assert restored.count() == 4
+        assert 101 not in restored and 99 not in restored and 6000 not in restored
+
+        with pytest.raises(ValueError):
+            bitmap.add(99)
+
+
+class TestEntryIndex:
+    def test_random_entries(self, replay, monkeypatch):
+        entry_index = limoon.EntryIndex()
+        entry_index.observe_entrys([1, 4])
+        monkeypatch.setattr(core, "entry_index", entry_index)
+        entrys = limoon.get_random_entries(2, max_requests=4)
+
+        assert next(entrys).id == 1
+
+        with pytest.raises(limoon.EntryNotFound):
+            next(entrys)
+
+        assert list(entry_index.missing) == [2, 3, 4]
+        assert entry_index.max_id == 4
+
+        replay.requests.clear()
+
+        assert limoon.get_random_entry().id == 1
+        assert replay.requests == ["https://eksisozluk.com/entry/1"]
+
+    def test_max_id_from_debe(self, replay, monkeypatch):
+        monkeypatch.setattr(core, "entry_index", None)
+
+        with pytest.raises(limoon.EntryNotFound):
+            list(limoon.get_random_entries(1, max_requests=2))
+
+        assert core.entry_index.max_id == 170000012
+        assert core.entry_index.upper == 171700012
+        assert len(replay.requests) == 3
+
+    def test_missing_above_max_id(self):
+        entry_index = limoon.EntryIndex()
+        entry_index.observe(5, found=False)
+        entry_index.observe(10)
+        entry_index.observe(11, found=False)
+        entry_index.observe(9, found=False)
+
+        assert list(entry_index.found) == [10]
+        assert list(entry_index.missing) == [9]
+        assert sorted(entry_index.sample(20)) == list(range(1, 9)) + [10]
+
+    def test_persisted(self, tmp_path):
+        path = str(tmp_path / "entrys.index")
+        entry_index = limoon.EntryIndex(path)
+        entry_index.observe_entrys([3, 300])
+        entry_index.observe(7, found=False)
+        entry_index.save()
+        loaded = limoon.EntryIndex(path)
+
+        assert loaded.max_id == 300
+        assert list(loaded.found) == [3, 300]
+        assert list(loaded.missing) == [7]
+
+
+class SlowAdapter(ReplayAdapter):
+    def page(self, url):
+        time.sleep(0.2)
+        return super().page(url)
+
+
+class TestSingleFlight:
+    def get_topics(self, count=6):
+        barrier = threading.Barrier(count)
+        topics = [None] * count
+
+        def get_topic(index):
+            barrier.wait()
+            topics[index] = limoon.get_topic("linux--32084")
+
+        threads = [threading.Thread(target=get_topic, args=(index,)) for index in range(count)]
+
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        return topics
+
+    def slow(self, monkeypatch):
+        adapter = SlowAdapter()
+        monkeypatch.setattr(core, "limiter", None)
+        monkeypatch.setattr(core.session, "adapters", {})
+        core.session.mount("https://", adapter)
+
+        return adapter
+
+    def test_threads(self, monkeypatch):
+        adapter = self.slow(monkeypatch)
+        entrys = [list(topic.entrys) for topic in self.get_topics()]
+
+        assert len(adapter.requests) == 1
+        assert all(topic_entrys[0] is entrys[0][0] for topic_entrys in entrys)
+        assert len(core._flight) == len(utils._parse_flight) == 0
+
+    def test_disabled(self, monkeypatch):
+        adapter = self.slow(monkeypatch)
+        monkeypatch.setattr(core, "coalesce", False)
+        self.get_topics(2)
+
+        assert len(adapter.requests) == 2
+
+    def test_exception_shared(self):
+        flight = utils.SingleFlight()
+        started = threading.Event()
+        errors = []
+
+        def fail():
+            started.set()
+            time.sleep(0.2)
+            raise limoon.EntryNotFound()
+
+        def call():
+            try:
+                flight.do("key", fail)
+            except limoon.EntryNotFound as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=call)
+        thread.start()
+        started.wait()
+        call()
+        thread.join()
+
+        assert len(errors) == 2 and errors[0] is errors[1]
+        assert len(flight) == 0
+
+    def test_asyncio(self, replay_server, monkeypatch):
+        monkeypatch.setattr(replay_server, "adapter", SlowAdapter())
+
+        async def get_topics():
+            try:
+                return await asyncio.gather(*(aio.get_topic("linux--32084") for _ in range(5)))
+            finally:
+                await aio.close()
+
+        first, *others = asyncio.run(get_topics())
+        entry = next(first.entrys)
+
+        assert len(replay_server.adapter.requests) == 1
+        assert all(next(topic.entrys) is entry for topic in others)